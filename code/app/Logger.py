@@ -1,87 +1,145 @@
 import logging
+import logging.handlers
+import queue
+import atexit
+import threading
+import time
 import sys
 import os
 
+_LOG_PATH = os.environ.get("INVENTORY_LOG", os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'inventory.log')) # log file location (resources folder by default), can be overridden with INVENTORY_LOG
+
+'''
+Stands in for logging.Logger.findCaller and returns the same placeholder values logging uses when source info is off
+'''
+def _no_caller(stack_info=False, stacklevel=1):
+    return "(unknown file)", 0, "(unknown function)", None # (filename, line number, function name, stack info)
+
 '''
 Class logger that wraps the built in logger inside of it
 '''
 class Logger:
     logger = None # placeholder for variable _logger
+    log_queue = None # placeholder for the queue shared between callers and the listener
+    listener = None # placeholder for the background listener that owns the real handlers
+    _init_lock = threading.Lock() # makes sure only one thread sets up the handlers
+    _initialized = False # set once the handlers are attached, read without the lock on the fast path
 
     '''
     Handles the initialization of logger
     '''
     @staticmethod # static method
     def initialize(): # sets up logger configuration
-        if Logger.logger is None: # if no logger has been created yet
-            Logger.logger = logging.getLogger("InventoryLogger") # set new logger called InventoryLogger
-            Logger.logger.setLevel(logging.DEBUG) # minimum severity as debug
-            Logger.logger.propagate = False
-
-        if not Logger.logger.handlers: # check if handlers are attached, if not add them
-            log_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'inventory.log') # get the log path (from inventory to resoruces) to update log file
-            file_handler = logging.FileHandler(log_path) # pass the log path (resource folder) to append the already existing log file
-            file_handler.setLevel(logging.DEBUG) # log everything from debug
-            file_format = logging.Formatter('%(levelname)s (%(asctime)s): %(message)s', datefmt='%Y-%m-%d %H:%M:%S') # define format for logs
-            file_handler.setFormatter(file_format) # attach defined format to file writer
-
-            console_handler = logging.StreamHandler(sys.stdout) # writes logs to standard output
-            console_handler.setLevel(logging.DEBUG) # minimum level to debug
-            console_format = ColorFormatter() # allow for custom colors in console
-            console_handler.setFormatter(console_format) # attach color formatter to console
-
-            Logger.logger.addHandler(file_handler) # add file handler to the logger
-            Logger.logger.addHandler(console_handler) # add console handler to logger
-
-            print("Logger handler count:", len(Logger.logger.handlers))
+        if Logger._initialized: # already set up, no locking needed
+            return
+        with Logger._init_lock: # only one thread may attach handlers
+            if Logger._initialized: # another thread finished setting up while this one waited
+                return
+            if Logger.logger is None: # if no logger has been created yet
+                Logger.logger = logging.getLogger("InventoryLogger") # set new logger called InventoryLogger
+                Logger.logger.setLevel(logging.DEBUG) # minimum severity as debug
+                Logger.logger.propagate = False
+                Logger.logger.findCaller = _no_caller # formats never show file/line/function, so skip the frame walk on every record
+                logging.logThreads = False # thread name/id is never logged
+                logging.logProcesses = False # process id is never logged
+                logging.logMultiprocessing = False # process name is never logged
+
+            if not Logger.logger.handlers: # check if handlers are attached, if not add them
+                file_handler = BufferedFileHandler(_LOG_PATH) # pass the log path (resource folder) to append the already existing log file
+                file_handler.setLevel(logging.DEBUG) # log everything from debug
+                file_format = FastFormatter(datefmt='%Y-%m-%d %H:%M:%S') # same "LEVEL (time): message" lines without the generic %()s machinery
+                file_handler.setFormatter(file_format) # attach defined format to file writer
+
+                console_handler = logging.StreamHandler(sys.stdout) # writes logs to standard output
+                console_handler.setLevel(logging.DEBUG) # minimum level to debug
+                console_format = ColorFormatter() # allow for custom colors in console
+                console_handler.setFormatter(console_format) # attach color formatter to console
+
+                Logger.log_queue = queue.Queue(-1) # unbounded queue so callers never block on a full queue
+                Logger.listener = logging.handlers.QueueListener(Logger.log_queue, file_handler, console_handler, respect_handler_level=True) # background thread that does the actual file/console writes
+                Logger.listener.start() # start draining the queue
+                atexit.register(file_handler.flush) # registered first so it runs after the listener has drained the queue
+                atexit.register(Logger.listener.stop) # flush whatever is left in the queue on shutdown
+
+                Logger.logger.addHandler(logging.handlers.QueueHandler(Logger.log_queue)) # callers only enqueue records, the listener writes them
+
+                print("Logger handler count:", len(Logger.logger.handlers))
+
+            Logger._initialized = True # publish only after the handlers are attached
+
+
+class BufferedFileHandler(logging.FileHandler):
+    BUFFER_SIZE = 64 * 1024 # bytes held in memory before the file is written to
 
     '''
-    Handles the information types of logger
+    Opens the log file with a large write buffer instead of the default one
 
     Parameters:
-        message:
-            message associated with the log
+        self:
+            instance of object
     '''
-    @staticmethod # static method
-    def info(message):
-        Logger.initialize() # call initialize
-        Logger.logger.info(message) # log message at info level
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE, encoding=self.encoding) # buffered text stream so info lines are batched into few write calls
 
     '''
-    Handles the warning types of logger
+    Writes the record to the buffer and only flushes for warnings and above
 
     Parameters:
-        message:
-            message associated with the log
+        self:
+            instance of object
+        record:
+            LogRecord object to be passed
     '''
-    @staticmethod # static method
-    def warning(message):
-        Logger.initialize() # call initialize
-        Logger.logger.warning(message) # log message at warning level
-
+    def emit(self, record):
+        if self.stream is None: # file is opened lazily on the first record
+            self.stream = self._open() # open the buffered stream
+        try:
+            self.stream.write(self.format(record) + self.terminator) # write into the buffer
+            if record.levelno >= logging.WARNING: # problems should reach the disk right away
+                self.flush() # push the buffer out to the file
+        except RecursionError: # same as the built in handlers
+            raise
+        except Exception:
+            self.handleError(record) # let logging report the failure
+
+
+class FastFormatter(logging.Formatter):
     '''
-    Handles the error types of logger
+    Sets up the timestamp cache
 
     Parameters:
-        message:
-            message associated with the log
+        self:
+            instance of object
+        datefmt:
+            strftime format used for the timestamp
     '''
-    @staticmethod # static method
-    def error(message):
-        Logger.initialize() # call initialize
-        Logger.logger.error(message) # log message at error level
+    def __init__(self, datefmt='%Y-%m-%d %H:%M:%S'):
+        super().__init__(datefmt=datefmt) # keep the base class set up for exception/stack formatting
+        self._last_sec = None # second the cached timestamp belongs to
+        self._cached_ts = '' # formatted timestamp for that second
 
     '''
-    Handles the debug types of logger
+    Formats a record as "LEVEL (time): message", building the timestamp at most once per second
 
     Parameters:
-        message:
-            message associated with the log
+        self:
+            instance of object
+        record:
+            LogRecord object to be passed
     '''
-    @staticmethod # static method
-    def debug(message):
-        Logger.initialize() # call initialize
-        Logger.logger.debug(message) # log message at debug level
+    def format(self, record):
+        sec = int(record.created) # timestamps only have second resolution
+        if sec != self._last_sec: # first record in a new second
+            self._cached_ts = time.strftime(self.datefmt, self.converter(sec)) # format the time once for this second
+            self._last_sec = sec # remember which second is cached
+        message = f"{record.levelname} ({self._cached_ts}): {record.getMessage()}" # build the line directly
+        if record.exc_info and not record.exc_text: # exception attached but not formatted yet
+            record.exc_text = self.formatException(record.exc_info) # format the traceback once
+        if record.exc_text: # add the traceback like the default formatter does
+            message = f"{message}\n{record.exc_text}"
+        if record.stack_info: # add the stack like the default formatter does
+            message = f"{message}\n{self.formatStack(record.stack_info)}"
+        return message # return the finished line
 
 
 class ColorFormatter(logging.Formatter):
@@ -94,6 +152,28 @@ class ColorFormatter(logging.Formatter):
     }
     RESET = "\033[0m" # resets the color
 
+    '''
+    Builds one formatter per level up front with the color codes baked into its format string
+
+    Parameters:
+        self:
+            instance of object
+        fmt:
+            format string used for every level
+        datefmt:
+            date format passed to each formatter
+        use_color:
+            whether to add color codes, defaults to only coloring when stdout is a terminal
+    '''
+    def __init__(self, fmt='%(message)s', datefmt=None, use_color=None):
+        super().__init__(fmt, datefmt) # plain formatter used for levels without a color
+        if use_color is None: # not specified by the caller
+            use_color = sys.stdout.isatty() # piped or redirected output should not contain escape codes
+        self._fmts = { # level number -> formatter with that level's color already in the format string
+            getattr(logging, name): logging.Formatter(f"{color}{fmt}{self.RESET}" if use_color else fmt, datefmt) # reset the color after to make sure it doesnt carry into other lines
+            for name, color in self.COLORS.items()
+        }
+
     '''
     Handles the formatting of different levels and what their color should be
 
@@ -104,7 +184,21 @@ class ColorFormatter(logging.Formatter):
             LogRecord object to be passed
     '''
     def format(self, record):
-        color = self.COLORS.get(record.levelname, self.RESET) # grab color based on log level
-        message = super().format(record) # set the message as that color
-        return f"{color}{message}{self.RESET}" # reset the color after to make sure it doesnt carry into other lines
- 
\ No newline at end of file
+        formatter = self._fmts.get(record.levelno) # grab the prebuilt formatter for this level
+        if formatter is None: # custom level with no color assigned
+            return super().format(record) # format without color
+        return formatter.format(record) # format with the level's color
+
+
+'''
+Configures the logger once when this module is first imported and binds the level methods of the
+underlying logging.Logger straight onto Logger, so every call is a single method call with no setup checks
+
+Logger.info/warning/error/debug take a message with optional %s placeholders followed by their values,
+the values are only substituted if the record is actually emitted
+'''
+Logger.initialize() # set up the handlers a single time for the whole process
+Logger.info = Logger.logger.info # log message at info level
+Logger.warning = Logger.logger.warning # log message at warning level
+Logger.error = Logger.logger.error # log message at error level
+Logger.debug = Logger.logger.debug # log message at debug level
@@ -1,16 +1,68 @@
+import itertools
+import orjson
 from flask import Blueprint, jsonify, request, Response
+from werkzeug.routing import BaseConverter
 from app.inventory_manager import InventoryManager
+from utilities import gzip_body
 from Logger import Logger
 
 api = Blueprint('api', __name__) # creates a Flask Blueprint named 'api'
 inventory = InventoryManager() # creates an instance of the InventoryManager class
+_SUCCESS_BODY = b'{"success":true}' # pre-encoded body shared by every successful write response
+_version_counter = itertools.count(1) # source of new cabinet list versions, next() on it is atomic
+_cabinets_version = 0 # bumped after every successful drawer write made through this blueprint
+_cabinets_cache = None # (version, encoded body) of the last cabinet list served
 
-def validate_int(val, name):
+class RCConverter(BaseConverter):
+    """url converter that matches a drawer address like "65_3" and returns it as a (row, col) tuple.
+    """
+    regex = r'\d+_\d+' # one regex match instead of two int converters joined by a literal
+
+    def to_python(self, value):
+        """converts the matched url segment into a tuple.
+
+        Args:
+            value (str): the matched segment, e.g. "65_3".
+
+        Returns:
+            tuple: the (row, col) integers.
+        """
+        row, col = value.split('_', 1) # splits at the separator
+        return int(row), int(col) # converts both halves to integers
+
+    def to_url(self, value):
+        """converts a (row, col) tuple back into a url segment.
+
+        Args:
+            value (tuple): the (row, col) integers.
+
+        Returns:
+            str: the url segment, e.g. "65_3".
+        """
+        return f"{value[0]}_{value[1]}" # joins both halves with the separator
+
+@api.record_once # runs once when the blueprint is registered, before its routes are added
+def _register_converters(state):
+    """registers the custom url converters used by this blueprint on the application.
+
+    Args:
+        state (flask.blueprints.BlueprintSetupState): the registration state holding the app.
+    """
+    state.app.url_map.converters['rc'] = RCConverter # makes <rc:...> available to the routes below
+
+def _invalidate_cabinets():
+    """marks the cached cabinet list as stale after a drawer write.
+    """
+    global _cabinets_version
+    _cabinets_version = next(_version_counter) # any cache built for an older version is ignored from now on
+
+def validate_int(val, name, _int=int):
     """validates if a given value can be converted to an integer.
 
     Args:
         val (any): the value to be validated.
         name (str): the name of the value, used for error messages.
+        _int (type, optional): int bound as a local default so the success path skips the global lookup.
 
     Raises:
         ValueError: if the value cannot be converted to an integer.
@@ -19,7 +71,7 @@ def validate_int(val, name):
         int: the integer representation of the validated value.
     """
     try: # handles errors
-        return int(val) # attempts to convert the value to an integer and returns it
+        return _int(val) # attempts to convert the value to an integer and returns it
     except (ValueError, TypeError): # catches ValueError or TypeError if conversion fails
         raise ValueError(f"invalid {name}: {val}") # raises a ValueError with a descriptive message
 
@@ -34,12 +86,19 @@ def get_cabinets():
         json: a JSON response containing the list of cabinet names.
         Response: an error response if the operation fails.
     """
+    global _cabinets_cache
     try: # handles errors
+        cached = _cabinets_cache # reads the cache once so a concurrent refresh cannot change it mid-check
+        if cached is not None and cached[0] == _cabinets_version: # checks if no write happened since it was built
+            return Response(cached[1], mimetype='application/json') # returns the cached cabinet list
+        version = _cabinets_version # captured before reading so a write during the query leaves the entry stale
         cabinets = inventory.get_all_cabinets() # retrieves all cabinet names using the inventory manager
+        body = orjson.dumps({"cabinets": cabinets}) # encodes the cabinet list once for this version
+        _cabinets_cache = (version, body) # stores the encoded list for later requests
         Logger.info("fetched all cabinet names") # logs an informational message
-        return jsonify({"cabinets": cabinets}) # returns a JSON response with the cabinet names
+        return Response(body, mimetype='application/json') # returns a JSON response with the cabinet names
     except Exception as e: # catches any exception that occurs
-        Logger.error(f"failed to fetch cabinets: {e}") # logs an error message with the exception details
+        Logger.error("failed to fetch cabinets: %s", e) # logs an error message with the exception details
         return Response("internal server error", status=500) # returns a 500 Internal Server Error response
 
 @api.route('/api/cabinets/<cabinet_name>/drawers', methods=['GET']) # defines a route for GET requests to /api/cabinets/<cabinet_name>/drawers
@@ -55,10 +114,15 @@ def get_drawers(cabinet_name):
     """
     try: # handles errors
         drawers = inventory.get_inventory(cabinet_name) # retrieves the inventory for the specified cabinet
-        Logger.info(f"fetched drawers for cabinet '{cabinet_name}'") # logs an informational message
-        return jsonify(drawers) # returns a JSON response with the drawers
+        body, gzipped = gzip_body(orjson.dumps(drawers), request.accept_encodings) # compresses large payloads for clients that accept gzip
+        response = Response(body, mimetype='application/json') # builds the JSON response with the drawers
+        if gzipped: # checks if the body was compressed
+            response.headers['Content-Encoding'] = 'gzip' # tells the client to decompress it
+        response.headers['Vary'] = 'Accept-Encoding' # caches must key on the encoding the client asked for
+        Logger.info("fetched drawers for cabinet '%s'", cabinet_name) # logs an informational message
+        return response # returns a JSON response with the drawers
     except Exception as e: # catches any exception that occurs
-        Logger.error(f"failed to fetch drawers for cabinet '{cabinet_name}': {e}") # logs an error message
+        Logger.error("failed to fetch drawers for cabinet '%s': %s", cabinet_name, e) # logs an error message
         return Response("internal server error", status=500) # returns a 500 Internal Server Error response
 
 @api.route('/api/cabinets/<cabinet_name>/drawers', methods=['POST']) # defines a route for POST requests to /api/cabinets/<cabinet_name>/drawers
@@ -73,75 +137,128 @@ def add_drawer(cabinet_name):
         Response: an error response if the operation fails due to missing data, validation issues, or other exceptions.
     """
     try: # handles errors
-        data = request.json # gets the JSON data from the request body
+        data = orjson.loads(request.get_data(cache=False) or b'{}') # parses the JSON request body with orjson
         row = data.get("row") # extracts the 'row' value from the data
         col = data.get("col") # extracts the 'col' value from the data
-        name = data.get("name", "") # extracts the 'name' value, defaults to an empty string
-        quantity = data.get("quantity", 0) # extracts the 'quantity' value, defaults to 0
-
         if row is None or col is None: # checks if 'row' or 'col' are missing
             return Response("missing 'row' or 'col' in request", status=400) # returns a 400 Bad Request if data is missing
 
-        row = validate_int(row, "row") # validates and converts 'row' to an integer
-        col = validate_int(col, "col") # validates and converts 'col' to an integer
-        quantity = validate_int(quantity, "quantity") # validates and converts 'quantity' to an integer
+        try: # converts all three values in one block instead of three validate_int calls
+            row = int(row) # converts 'row' to an integer
+            col = int(col) # converts 'col' to an integer
+            quantity = int(data.get("quantity", 0)) # extracts and converts 'quantity', defaults to 0
+        except (TypeError, ValueError) as e: # catches values that cannot be converted
+            Logger.warning("validation error adding drawer: %s", e) # logs a warning message
+            return Response(f"invalid row, col or quantity: {e}", status=400) # returns a 400 Bad Request with the conversion error
+        name = data.get("name", "") # extracts the 'name' value, defaults to an empty string
+
+        inventory.update_drawer_rc(row, col, name, quantity) # updates the drawer with the provided information
+        _invalidate_cabinets() # the cabinet list may have changed
+        Logger.info("added drawer %s_%s to cabinet '%s'", row, col, cabinet_name) # logs an informational message
+        return Response(_SUCCESS_BODY, status=200, mimetype='application/json') # returns a JSON response indicating success
+    except orjson.JSONDecodeError as je: # catches a request body that is not valid JSON
+        Logger.warning("invalid json body adding drawer: %s", je) # logs a warning message
+        return Response("invalid JSON body", status=400) # returns a 400 Bad Request for the malformed body
+    except ValueError as ve: # catches ValueError specifically for validation issues
+        Logger.warning("validation error adding drawer: %s", ve) # logs a warning message
+        return Response(str(ve), status=400) # returns a 400 Bad Request with the validation error message
+    except Exception as e: # catches any other exception
+        Logger.error("failed to add drawer: %s", e) # logs an error message
+        return Response("internal server error", status=500) # returns a 500 Internal Server Error response
+
+@api.route('/api/cabinets/<cabinet_name>/drawers:batch', methods=['POST']) # defines a route for POST requests that add many drawers at once
+def add_drawers_batch(cabinet_name):
+    """adds or replaces several drawers in a specific cabinet with a single database transaction.
+
+    Args:
+        cabinet_name (str): the name of the cabinet to which the drawers will be added.
+
+    Returns:
+        json: a JSON response indicating success and how many drawers were written.
+        Response: an error response if the operation fails due to missing data, validation issues, or other exceptions.
+    """
+    try: # handles errors
+        data = orjson.loads(request.get_data(cache=False) or b'{}') or {} # parses the JSON request body with orjson
+        items = data.get("items") # extracts the list of drawers from the data
+        if not isinstance(items, list): # checks if the list is missing or not a list
+            return Response("missing 'items' list in request", status=400) # returns a 400 Bad Request if data is missing
+
+        drawers = [] # collects validated (drawer id, name, quantity) tuples
+        for item in items: # validates every drawer before anything is written
+            row = item.get("row") # extracts the 'row' value from the item
+            col = item.get("col") # extracts the 'col' value from the item
+            if row is None or col is None: # checks if 'row' or 'col' are missing
+                return Response("missing 'row' or 'col' in batch item", status=400) # returns a 400 Bad Request if data is missing
+            row = validate_int(row, "row") # validates and converts 'row' to an integer
+            col = validate_int(col, "col") # validates and converts 'col' to an integer
+            quantity = validate_int(item.get("quantity", 0), "quantity") # validates and converts 'quantity' to an integer
+            drawers.append((f"{chr(row)}{col}", item.get("name", ""), quantity)) # queues the drawer for the bulk write
 
-        inventory.update_drawer(f"{chr(row)}{col}", name, quantity) # updates the drawer with the provided information
-        Logger.info(f"added drawer {row}_{col} to cabinet '{cabinet_name}'") # logs an informational message
-        return jsonify({"success": True}) # returns a JSON response indicating success
+        count = inventory.update_drawers_bulk(drawers) # writes all drawers in one transaction
+        _invalidate_cabinets() # the cabinet list may have changed
+        Logger.info("bulk-added %d drawers to cabinet '%s'", count, cabinet_name) # logs one informational message for the whole batch
+        return jsonify({"success": True, "count": count}) # returns a JSON response indicating success
+    except orjson.JSONDecodeError as je: # catches a request body that is not valid JSON
+        Logger.warning("invalid json body adding drawers: %s", je) # logs a warning message
+        return Response("invalid JSON body", status=400) # returns a 400 Bad Request for the malformed body
     except ValueError as ve: # catches ValueError specifically for validation issues
-        Logger.warning(f"validation error adding drawer: {ve}") # logs a warning message
+        Logger.warning("validation error adding drawers: %s", ve) # logs a warning message
         return Response(str(ve), status=400) # returns a 400 Bad Request with the validation error message
     except Exception as e: # catches any other exception
-        Logger.error(f"failed to add drawer: {e}") # logs an error message
+        Logger.error("failed to add drawers: %s", e) # logs an error message
         return Response("internal server error", status=500) # returns a 500 Internal Server Error response
 
-@api.route('/api/cabinets/<cabinet_name>/drawers/<int:row>_<int:col>', methods=['PUT']) # defines a route for PUT requests to update a specific drawer
-def update_drawer(cabinet_name, row, col):
+@api.route('/api/cabinets/<cabinet_name>/drawers/<rc:rc>', methods=['PUT']) # defines a route for PUT requests to update a specific drawer
+def update_drawer(cabinet_name, rc):
     """updates an existing drawer in a specific cabinet.
 
     Args:
         cabinet_name (str): the name of the cabinet where the drawer is located.
-        row (int): the row identifier of the drawer.
-        col (int): the column identifier of the drawer.
+        rc (tuple): the (row, col) identifiers of the drawer.
 
     Returns:
         json: a JSON response indicating success.
         Response: an error response if the operation fails due to validation issues or other exceptions.
     """
+    row, col = rc # unpacks the drawer address
     try: # handles errors
-        data = request.json or {} # gets the JSON data from the request, defaults to an empty dictionary
+        data = orjson.loads(request.get_data(cache=False) or b'{}') or {} # parses the JSON request body with orjson, defaults to an empty dictionary
         name = data.get("name", "") # extracts the 'name' value, defaults to an empty string
         quantity = data.get("quantity", 0) # extracts the 'quantity' value, defaults to 0
         quantity = validate_int(quantity, "quantity") # validates and converts 'quantity' to an integer
 
-        inventory.update_drawer(f"{chr(row)}{col}", name, quantity) # updates the drawer with the provided information
-        Logger.info(f"updated drawer {row}_{col} in cabinet '{cabinet_name}'") # logs an informational message
-        return jsonify({"success": True}) # returns a JSON response indicating success
+        inventory.update_drawer_rc(row, col, name, quantity) # updates the drawer with the provided information
+        _invalidate_cabinets() # the cabinet list may have changed
+        Logger.info("updated drawer %s_%s in cabinet '%s'", row, col, cabinet_name) # logs an informational message
+        return Response(_SUCCESS_BODY, status=200, mimetype='application/json') # returns a JSON response indicating success
+    except orjson.JSONDecodeError as je: # catches a request body that is not valid JSON
+        Logger.warning("invalid json body updating drawer: %s", je) # logs a warning message
+        return Response("invalid JSON body", status=400) # returns a 400 Bad Request for the malformed body
     except ValueError as ve: # catches ValueError specifically for validation issues
-        Logger.warning(f"validation error updating drawer: {ve}") # logs a warning message
+        Logger.warning("validation error updating drawer: %s", ve) # logs a warning message
         return Response(str(ve), status=400) # returns a 400 Bad Request with the validation error message
     except Exception as e: # catches any other exception
-        Logger.error(f"failed to update drawer: {e}") # logs an error message
+        Logger.error("failed to update drawer: %s", e) # logs an error message
         return Response("internal server error", status=500) # returns a 500 Internal Server Error response
 
-@api.route('/api/cabinets/<cabinet_name>/drawers/<int:row>_<int:col>', methods=['DELETE']) # defines a route for DELETE requests to remove a specific drawer
-def delete_drawer(cabinet_name, row, col):
+@api.route('/api/cabinets/<cabinet_name>/drawers/<rc:rc>', methods=['DELETE']) # defines a route for DELETE requests to remove a specific drawer
+def delete_drawer(cabinet_name, rc):
     """deletes a drawer from a specific cabinet by setting its name and quantity to default values.
 
     Args:
         cabinet_name (str): the name of the cabinet from which the drawer will be deleted.
-        row (int): the row identifier of the drawer.
-        col (int): the column identifier of the drawer.
+        rc (tuple): the (row, col) identifiers of the drawer.
 
     Returns:
         json: a JSON response indicating success.
         Response: an error response if the operation fails.
     """
+    row, col = rc # unpacks the drawer address
     try: # handles errors
-        inventory.update_drawer(f"{chr(row)}{col}", "", 0) # effectively "deletes" the drawer by setting its name to empty and quantity to 0
-        Logger.info(f"deleted drawer {row}_{col} from cabinet '{cabinet_name}'") # logs an informational message
-        return jsonify({"success": True}) # returns a JSON response indicating success
+        inventory.update_drawer_rc(row, col, "", 0) # effectively "deletes" the drawer by setting its name to empty and quantity to 0
+        _invalidate_cabinets() # the cabinet list may have changed
+        Logger.info("deleted drawer %s_%s from cabinet '%s'", row, col, cabinet_name) # logs an informational message
+        return Response(_SUCCESS_BODY, status=200, mimetype='application/json') # returns a JSON response indicating success
     except Exception as e: # catches any exception
-        Logger.error(f"failed to delete drawer: {e}") # logs an error message
+        Logger.error("failed to delete drawer: %s", e) # logs an error message
         return Response("internal server error", status=500) # returns a 500 Internal Server Error response
\ No newline at end of file
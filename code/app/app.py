@@ -1,46 +1,143 @@
-from flask import Flask, render_template, request, redirect, jsonify, make_response, url_for
+from flask import Flask, render_template, request, redirect, jsonify, make_response, url_for, g
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 import os
+import atexit
 import hashlib
-import json
+import base64
+import gzip
 import time
 import threading
-import csv
+import queue
+import heapq
+import orjson
+from waitress import serve
 
 from inventory_manager import InventoryManager
 from system_stats import SystemStats
 from export_manager import ExportManager
 from import_manager import ImportManager
-from utilities import pad_inventory, generate_all_drawer_keys
+from utilities import pad_inventory, pad_inventory_iter, generate_all_drawer_keys, parse_bulk_line, csv_escape
+from json_provider import OrjsonProvider
 from Logger import Logger
 
 app = Flask(__name__) # initializes the Flask application
+app.json = OrjsonProvider(app) # serializes jsonify responses with orjson
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..')) # defines the absolute path to the project root directory
 DB_PATH = os.path.join(PROJECT_ROOT, 'resources', 'database.db') # constructs the full path to the database file
+ALL_DRAWER_KEYS = generate_all_drawer_keys() # every drawer key in cabinet order, the layout never changes at runtime
+MAX_BULK_BYTES = 1_000_000 # largest bulk update request body accepted
+MAX_BULK_LINES = 10_000 # most non-empty lines accepted in one bulk update
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024 # rejects any request body over 16MB, including uploads, with a 413
 
 try: # attempts to initialize the InventoryManager
     inventory_manager = InventoryManager(DB_PATH) # creates an instance of InventoryManager with the specified database path
+    atexit.register(inventory_manager.close) # closes the pooled connections when the process exits
 except Exception as e: # catches any exception during initialization
-    Logger.error(f"failed to initialize inventorymanager: {e}") # logs an error if initialization fails
+    Logger.error("failed to initialize inventorymanager: %s", e) # logs an error if initialization fails
     raise # re-raises the exception
 
 try: # attempts to initialize the SystemStats
     system_stats = SystemStats() # creates an instance of SystemStats
 except Exception as e: # catches any exception during initialization
-    Logger.error(f"failed to initialize systemstats: {e}") # logs an error if initialization fails
+    Logger.error("failed to initialize systemstats: %s", e) # logs an error if initialization fails
     raise # re-raises the exception
 
 try: # attempts to initialize the ExportManager
     export_manager = ExportManager(inventory_manager, pad_inventory) # creates an instance of ExportManager
 except Exception as e: # catches any exception during initialization
-    Logger.error(f"failed to initialize exportmanager: {e}") # logs an error if initialization fails
+    Logger.error("failed to initialize exportmanager: %s", e) # logs an error if initialization fails
     raise # re-raises the exception
 
 try: # attempts to initialize the ImportManager
     import_manager = ImportManager(inventory_manager, pad_inventory) # creates an instance of ImportManager
 except Exception as e: # catches any exception during initialization
-    Logger.error(f"failed to initialize importmanager: {e}") # logs an error if initialization fails
+    Logger.error("failed to initialize importmanager: %s", e) # logs an error if initialization fails
     raise # re-raises the exception
 
+_stats_snapshot = None # latest result of system_stats.get_all_stats(), replaced as a whole by the sampler
+_stats_lock = threading.Lock() # guards _stats_snapshot and _stats_sampler_started
+_stats_sampler_started = False # makes sure only one sampler thread runs
+
+def _sample_stats(interval_seconds=5):
+    """keeps _stats_snapshot up to date so /api/pi-stats never waits on psutil.
+
+    Args:
+        interval_seconds (int, optional): the interval in seconds between samples. Defaults to 5, half the page's polling interval.
+    """
+    global _stats_snapshot
+    while True: # runs indefinitely
+        try: # handles errors during sampling
+            stats = system_stats.get_all_stats() # collects every stat, cpu usage covers the time since the previous sample
+            with _stats_lock: # swaps the snapshot in one step
+                _stats_snapshot = stats # publishes the new sample
+        except Exception as e: # catches any exception during sampling
+            Logger.error("stats sampling failed: %s", e) # logs an error message
+        time.sleep(interval_seconds) # pauses execution for the specified interval
+
+def _start_stats_sampler():
+    """starts the background stats sampler unless it is already running.
+    """
+    global _stats_sampler_started
+    with _stats_lock: # only one caller may start the thread
+        if _stats_sampler_started: # checks if the sampler is already running
+            return # nothing to do
+        _stats_sampler_started = True # marks the sampler as started
+    threading.Thread(target=_sample_stats, daemon=True).start() # samples in the background for the life of the process
+
+_start_stats_sampler() # the first sample is ready shortly after startup
+
+_api_cache = {} # cabinet name -> (inventory json bytes, etag, gzipped json bytes or None) served by /api/inventory
+_api_cache_lock = threading.Lock() # guards _api_cache and _api_cache_generation
+_api_cache_generation = 0 # bumped on every invalidation so results computed before a write are not stored
+
+_backup_queue = queue.Queue() # cabinets changed since the last backup, None means every cabinet
+_backup_sections = {} # cabinet name -> its rendered backup rows, reused while the cabinet is unchanged
+_backup_lock = threading.Lock() # guards _backup_started
+_backup_started = False # makes sure only one backup thread runs
+
+def _invalidate(cabinet=None):
+    """drops cached /api/inventory data after the inventory changes.
+
+    Args:
+        cabinet (str, optional): the cabinet that changed. Defaults to None, which clears every cabinet.
+    """
+    global _api_cache_generation
+    with _api_cache_lock: # prevents a concurrent request from storing stale data
+        _api_cache_generation += 1 # marks any in-flight computation as outdated
+        if cabinet is None: # checks if every cabinet may have changed
+            _api_cache.clear() # drops all cached cabinets
+        else: # only one cabinet changed
+            _api_cache.pop(cabinet, None) # drops that cabinet if it was cached
+    if _backup_started: # nobody drains the queue until the backup thread runs
+        _backup_queue.put(cabinet) # tells the backup thread the cabinet needs saving
+
+@app.before_request # runs ahead of every route
+def _parse_cabinet():
+    """reads the cabinet query parameter once per request into g.cabinet, defaulting to 'Default'.
+    """
+    g.cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
+
+def safe_route(error):
+    """wraps a route so an unexpected exception is logged and answered with a 500 JSON error.
+
+    Args:
+        error (str): the error message sent back to the client.
+
+    Returns:
+        function: a decorator for the route.
+    """
+    def decorator(fn): # wraps the route function
+        @wraps(fn) # keeps the route's name so flask endpoints stay the same
+        def wrapper(*args, **kwargs): # runs the route and catches anything it raises
+            try: # attempts to run the route
+                return fn(*args, **kwargs) # returns the route's own response
+            except Exception as e: # catches any exception the route did not handle
+                Logger.error("%s failed: %s", fn.__name__, e) # logs an error message with the route name
+                return jsonify(success=False, error=error), 500 # returns a JSON error response with a 500 status code
+        return wrapper # returns the wrapped route
+    return decorator # returns the decorator
+
 @app.route('/') # defines the route for the root URL
 def index():
     """renders the main inventory page, displaying items for a specific cabinet.
@@ -51,31 +148,29 @@ def index():
     Returns:
         flask.Response: the rendered HTML template with inventory data.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
+    cabinet = g.cabinet # cabinet parsed by _parse_cabinet
     try: # attempts to retrieve and pad the inventory
-        inventory = inventory_manager.get_inventory(cabinet=cabinet) # retrieves the inventory for the specified cabinet
-        inventory = pad_inventory(inventory) # pads the inventory to ensure all drawer keys are present
+        inventory = inventory_manager.get_padded_inventory(cabinet) # retrieves the inventory for the specified cabinet with every drawer key present
     except Exception as e: # catches any exception during inventory loading
-        Logger.error(f"failed to load inventory for cabinet '{cabinet}': {e}") # logs an error message
+        Logger.error("failed to load inventory for cabinet '%s': %s", cabinet, e) # logs an error message
         inventory = {} # sets inventory to an empty dictionary in case of an error
     return render_template('index.html', inventory=inventory, cabinet=cabinet) # renders the index.html template with the inventory and cabinet name
 
 @app.route('/clear', methods=['POST']) # defines the route for clearing inventory via a POST request
+@safe_route("failed to clear inventory") # answers with a 500 JSON error if clearing fails
 def clear():
     """clears all inventory data from the database.
 
     Returns:
         flask.Response: a JSON response indicating success or failure.
     """
-    try: # attempts to clear the inventory
-        inventory_manager.clear_inventory() # calls the clear_inventory method of the inventory manager
-        Logger.info("inventory cleared, redirecting to main page") # logs success and redirect
-        return redirect(url_for('index')) # redirects to the main page
-    except Exception as e: # catches any exception during the clear operation
-        Logger.error(f"failed to clear inventory: {e}") # logs an error message
-        return jsonify(success=False, error="failed to clear inventory"), 500 # returns a JSON response with an error and a 500 status code
+    inventory_manager.clear_inventory() # calls the clear_inventory method of the inventory manager
+    _invalidate() # every cabinet is now empty
+    Logger.info("inventory cleared, redirecting to main page") # logs success and redirect
+    return redirect(url_for('index')) # redirects to the main page
 
 @app.route('/update', methods=['POST']) # defines the route for updating inventory via a POST request
+@safe_route("failed to update inventory") # answers with a 500 JSON error if the database update fails
 def update():
     """updates a specific drawer's details in the inventory.
 
@@ -83,7 +178,7 @@ def update():
         flask.Response: a JSON response indicating success or failure.
     """
     data = request.get_json() # gets the JSON data from the request body
-    Logger.debug(f"received data for update: {data}") # logs the received data for debugging
+    Logger.debug("received data for update: %s", data) # logs the received data for debugging
 
     if not data: # checks if no data was provided
         Logger.warning("no data provided in update request") # logs a warning
@@ -94,7 +189,7 @@ def update():
         if qty < 0: # checks if the quantity is negative
             raise ValueError("quantity cannot be negative") # raises a ValueError if quantity is negative
     except (ValueError, TypeError) as e: # catches ValueError or TypeError during quantity conversion/validation
-        Logger.warning(f"invalid quantity error: {e}") # logs a warning for invalid quantity
+        Logger.warning("invalid quantity error: %s", e) # logs a warning for invalid quantity
         return jsonify(success=False, error="invalid quantity"), 400 # returns an error response with a 400 status code
 
     drawer_id = data.get('id') # extracts the drawer ID
@@ -105,55 +200,48 @@ def update():
         Logger.warning("drawer id missing in update data") # logs a warning
         return jsonify(success=False, error="drawer id missing"), 400 # returns an error response with a 400 status code
 
-    try: # attempts to update the drawer in the inventory manager
-        inventory_manager.update_drawer(drawer_id, name, qty, cabinet) # calls the update_drawer method
-        Logger.info(f"updated drawer {drawer_id} in cabinet '{cabinet}' with name '{name}' and qty {qty}") # logs a success message
-        return jsonify(success=True) # returns a JSON response indicating success
-    except Exception as e: # catches any exception during the database update
-        Logger.error(f"db update error: {e}") # logs an error message
-        return jsonify(success=False, error="failed to update inventory"), 500 # returns a JSON response with an error and a 500 status code
+    if inventory_manager.update_drawer(drawer_id, name, qty, cabinet): # calls the update_drawer method, false when nothing changed
+        _invalidate(cabinet) # the cabinet's cached data is now outdated
+    Logger.info("updated drawer %s in cabinet '%s' with name '%s' and qty %s", drawer_id, cabinet, name, qty) # logs a success message
+    return jsonify(success=True) # returns a JSON response indicating success
 
 @app.route('/api/pi-stats') # defines the route for retrieving Raspberry Pi system statistics
+@safe_route("failed to retrieve system stats") # answers with a 500 JSON error if the stats cannot be read
 def pi_stats():
-    """retrieves and returns system statistics.
+    """returns the latest system statistics collected by the background sampler.
 
     Returns:
         flask.Response: a JSON response containing system statistics or an error message.
     """
-    try: # attempts to get system statistics
-        stats = system_stats.get_all_stats() # calls the get_all_stats method of the system stats manager
-        return jsonify(stats) # returns a JSON response with the statistics
-    except Exception as e: # catches any exception during statistics retrieval
-        Logger.error(f"failed to get pi stats: {e}") # logs an error message
-        return jsonify(error="failed to retrieve system stats"), 500 # returns a JSON response with an error and a 500 status code
+    with _stats_lock: # reads the snapshot consistently
+        stats = _stats_snapshot # the most recent sample
+    if stats is None: # checks if the sampler hasn't finished its first pass yet
+        stats = system_stats.get_all_stats() # collects the stats directly this once
+    return jsonify(stats) # returns a JSON response with the statistics
 
 @app.route('/undo', methods=['POST']) # defines the route for performing an undo operation via a POST request
+@safe_route("undo operation failed") # answers with a 500 JSON error if the undo raises
 def undo():
     """performs an undo operation on the last inventory change.
 
     Returns:
         flask.Response: a JSON response indicating whether the undo was successful.
     """
-    try: # attempts to perform an undo
-        success = inventory_manager.undo() # calls the undo method of the inventory manager
-        return jsonify(success=success) # returns a JSON response indicating success or failure of the undo
-    except Exception as e: # catches any exception during the undo operation
-        Logger.error(f"undo failed: {e}") # logs an error message
-        return jsonify(success=False, error="undo operation failed"), 500 # returns a JSON response with an error and a 500 status code
+    success = inventory_manager.undo() # calls the undo method of the inventory manager
+    _invalidate() # the reverted action may belong to any cabinet
+    return jsonify(success=success) # returns a JSON response indicating success or failure of the undo
 
 @app.route('/redo', methods=['POST']) # defines the route for performing a redo operation via a POST request
+@safe_route("redo operation failed") # answers with a 500 JSON error if the redo raises
 def redo():
     """performs a redo operation on the last undone inventory change.
 
     Returns:
         flask.Response: a JSON response indicating whether the redo was successful.
     """
-    try: # attempts to perform a redo
-        success = inventory_manager.redo() # calls the redo method of the inventory manager
-        return jsonify(success=success) # returns a JSON response indicating success or failure of the redo
-    except Exception as e: # catches any exception during the redo operation
-        Logger.error(f"redo failed: {e}") # logs an error message
-        return jsonify(success=False, error="redo operation failed"), 500 # returns a JSON response with an error and a 500 status code
+    success = inventory_manager.redo() # calls the redo method of the inventory manager
+    _invalidate() # the reverted action may belong to any cabinet
+    return jsonify(success=success) # returns a JSON response indicating success or failure of the redo
 
 @app.route('/search', methods=['GET']) # defines the route for searching inventory via a GET request
 def search():
@@ -166,28 +254,9 @@ def search():
     Returns:
         flask.Response: the rendered HTML template with filtered inventory data.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
+    cabinet = g.cabinet # cabinet parsed by _parse_cabinet
     query = request.args.get('q', '').lower() # gets the 'q' query parameter (search query), converts to lowercase
-    try: # attempts to retrieve and pad the full inventory
-        full_inventory = inventory_manager.get_inventory(cabinet) # retrieves the full inventory for the specified cabinet
-        full_inventory = pad_inventory(full_inventory) # pads the inventory
-    except Exception as e: # catches any exception during inventory retrieval
-        Logger.error(f"failed to get inventory for search in cabinet '{cabinet}': {e}") # logs an error message
-        full_inventory = {} # sets full_inventory to an empty dictionary in case of an error
-
-    filtered_inventory = {} # initializes an empty dictionary for filtered results
-    for key, value in full_inventory.items(): # iterates through each item in the full inventory
-        try: # handles errors during filtering
-            if ( # checks if the query matches the drawer ID, name, or quantity
-                query in key.lower() or # checks if query is in lowercase drawer ID
-                query in (value.get('name') or '').lower() or # checks if query is in lowercase name (handling None)
-                query in str(value.get('qty', '')) # checks if query is in string representation of quantity
-            ):
-                filtered_inventory[key] = value # adds the matching item to the filtered inventory
-        except Exception as e: # catches any exception during filtering an item
-            Logger.warning(f"failed filtering inventory item '{key}': {e}") # logs a warning for the failed item
-            continue # continues to the next item
-
+    filtered_inventory = inventory_manager.search_inventory(cabinet, query) # lets sqlite filter the padded inventory by drawer ID, name, or quantity
     return render_template('index.html', inventory=filtered_inventory, query=query, cabinet=cabinet) # renders the index.html template with filtered inventory
 
 @app.route('/bulk_update', methods=['POST']) # defines the route for performing bulk updates via a POST request
@@ -199,79 +268,94 @@ def bulk_update():
         bulk_input (str): the text input containing lines of inventory data.
 
     Returns:
-        flask.Response: a redirect to the main inventory page after the update.
+        flask.Response: a redirect to the main inventory page after the update, or a 413 JSON error if the input is too large.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
+    cabinet = g.cabinet # cabinet parsed by _parse_cabinet
+    if request.content_length is not None and request.content_length > MAX_BULK_BYTES: # checks the size before the form is parsed
+        Logger.warning("bulk update body of %s bytes rejected for cabinet '%s'", request.content_length, cabinet) # logs a warning
+        return jsonify(success=False, error="bulk input too large"), 413 # returns an error response with a 413 status code
     text = request.form.get('bulk_input', '') # gets the 'bulk_input' from the form data
-    Logger.debug(f"bulk update input for cabinet '{cabinet}':\n{text}") # logs the received bulk update input
+    Logger.debug("bulk update input for cabinet '%s':\n%s", cabinet, text) # logs the received bulk update input
 
     if not text.strip(): # checks if the input text is empty or just whitespace
-        Logger.warning(f"bulk update called with empty input for cabinet '{cabinet}'") # logs a warning
+        Logger.warning("bulk update called with empty input for cabinet '%s'", cabinet) # logs a warning
         return redirect(f"/?cabinet={cabinet}") # redirects back to the main page if input is empty
 
     lines = [line.strip() for line in text.splitlines() if line.strip()] # splits the input text into lines, strips whitespace, and filters out empty lines
+    if len(lines) > MAX_BULK_LINES: # checks if there are more lines than one request may process
+        Logger.warning("bulk update of %s lines rejected for cabinet '%s'", len(lines), cabinet) # logs a warning
+        return jsonify(success=False, error="too many lines"), 413 # returns an error response with a 413 status code
     try: # attempts to retrieve and pad the inventory
-        inventory = inventory_manager.get_inventory(cabinet) # retrieves the inventory for the specified cabinet
-        inventory = pad_inventory(inventory) # pads the inventory
+        stored = inventory_manager.get_inventory(cabinet) # retrieves the drawers stored for the specified cabinet
+        inventory = pad_inventory(stored) # pads into a new dict so the stored keys stay known
     except Exception as e: # catches any exception during inventory loading
-        Logger.error(f"failed to load inventory for bulk update in cabinet '{cabinet}': {e}") # logs an error message
-        inventory = {} # sets inventory to an empty dictionary in case of an error
-
-    all_keys = generate_all_drawer_keys() # generates a list of all possible drawer keys
-    used_keys = set(inventory.keys()) # creates a set of keys currently in use in the inventory
-    unused_keys = [k for k in all_keys if k not in used_keys] # finds keys that are not currently used
+        Logger.error("failed to load inventory for bulk update in cabinet '%s': %s", cabinet, e) # logs an error message
+        stored, inventory = {}, {} # sets both to empty dictionaries in case of an error
+
+    used_keys = set(stored) # keys that already have a row in the database
+    unused_keys = [k for k in ALL_DRAWER_KEYS if k not in used_keys] # finds keys that are not currently used
+    heapq.heapify(unused_keys) # smallest free key first, same order as sorting them
+    name_index = {} # lowercase name -> drawer id, replaces scanning the inventory for every line
+    for loc, val in inventory.items(): # builds the index once
+        if val.get('name'): # empty drawers have no name to look up
+            name_index.setdefault(val['name'].lower(), loc) # keeps the first drawer for duplicate names, like the scan did
+    updates = [] # (drawer id, name, qty) tuples written together after parsing
+
+    def queue_update(location, name, qty): # collects a write and keeps the lookups current for later lines
+        updates.append((location, name, qty)) # queues the write for the single transaction
+        used_keys.add(location) # a key written by an earlier line is no longer free
+        if name: # cleared drawers keep their old index entry
+            name_index[name.lower()] = location # later lines with the same name find this drawer
 
     for line in lines: # iterates through each line of the bulk input
-        parts = [p.strip() for p in line.split(',')] # splits the line by comma and strips whitespace from each part
         try: # handles errors during processing of each line
-            if len(parts) == 3: # checks if the line has 3 parts (location, name, qty)
-                location, name, qty = parts # unpacks the parts into variables
-                qty = int(qty) # converts quantity to an integer
-                if qty == 0: # if quantity is 0, clear the drawer
-                    inventory_manager.update_drawer(location.upper(), "", 0, cabinet) # updates drawer to empty
-                else: # otherwise, update with provided name and quantity
-                    inventory_manager.update_drawer(location.upper(), name.strip(), qty, cabinet) # updates drawer
-            elif len(parts) == 2: # checks if the line has 2 parts (either location, qty or name, qty)
-                first, second = parts # unpacks the parts
-                if first.upper() in inventory: # if the first part is an existing drawer ID
-                    location = first.upper() # sets location as the uppercase first part
-                    qty = int(second) # converts the second part to quantity
+            parsed = parse_bulk_line(line) # splits the line and converts the quantity
+            if parsed is None: # checks if the line does not have 2 or 3 parts
+                Logger.warning("skipping malformed bulk update line: '%s' for cabinet '%s'", line, cabinet) # logs a warning for malformed line
+                continue # skips to the next line
+            first, name, qty = parsed # unpacks the normalized fields
+            if name is not None: # checks if the line had 3 parts (location, name, qty)
+                queue_update(first, name, qty) # updates drawer, already cleared by the parser if qty is 0
+            else: # the line had 2 parts (either location, qty or name, qty)
+                location = first.upper() # uppercases the first part once for the drawer lookup
+                if location in inventory: # if the first part is an existing drawer ID
                     if qty == 0: # if quantity is 0, clear the drawer
-                        inventory_manager.update_drawer(location, "", 0, cabinet) # updates drawer to empty
+                        queue_update(location, "", 0) # updates drawer to empty
                     else: # otherwise, update with existing name and new quantity
                         name = inventory[location]['name'] # gets the existing name
-                        inventory_manager.update_drawer(location, name, qty, cabinet) # updates drawer
+                        queue_update(location, name, qty) # updates drawer
                 else: # if the first part is not an existing drawer ID, assume it's a name
-                    qty = int(second) # converts the second part to quantity
-                    name = first.strip() # sets name as the stripped first part
-                    match = next((loc for loc, val in inventory.items() if val.get('name', '').lower() == name.lower()), None) # tries to find a drawer by name
+                    name = first # the first part is the name
+                    match = name_index.get(name.lower()) # tries to find a drawer by name
                     if match: # if a matching drawer by name is found
                         if qty == 0: # if quantity is 0, clear the drawer
-                            inventory_manager.update_drawer(match, "", 0, cabinet) # updates drawer to empty
+                            queue_update(match, "", 0) # updates drawer to empty
                         else: # otherwise, update with existing name and new quantity
-                            inventory_manager.update_drawer(match, name, qty, cabinet) # updates drawer
+                            queue_update(match, name, qty) # updates drawer
                     else: # if no match by name, try to assign to an unused key
-                        all_keys = generate_all_drawer_keys()
-                        current_inventory = inventory_manager.get_inventory(cabinet) # get current inventory for available keys
-                        used_keys = set(current_inventory.keys())
-                        available_keys = sorted(list(set(all_keys) - used_keys))
-                        if available_keys:
-                            location = available_keys[0]
-                            inventory_manager.update_drawer(location, name, qty, cabinet)
-                        else:
-                            Logger.warning(f"no available drawer id for line '{line}' in cabinet '{cabinet}'")
-                            continue
-            else: # if the line does not have 2 or 3 parts
-                Logger.warning(f"skipping malformed bulk update line: '{line}' for cabinet '{cabinet}'") # logs a warning for malformed line
-                continue # skips to the next line
+                        while unused_keys and unused_keys[0] in used_keys: # drops free keys taken by earlier lines
+                            heapq.heappop(unused_keys)
+                        if unused_keys: # checks if a free key is left
+                            queue_update(heapq.heappop(unused_keys), name, qty) # assigns the smallest free key
+                        else: # every key is taken
+                            Logger.warning("no available drawer id for line '%s' in cabinet '%s'", line, cabinet) # logs a warning
+                            continue # skips to the next line
 
         except Exception as e: # catches any exception during line processing
-            Logger.warning(f"failed processing bulk update line '{line}' for cabinet '{cabinet}': {e}") # logs a warning
+            Logger.warning("failed processing bulk update line '%s' for cabinet '%s': %s", line, cabinet, e) # logs a warning
             continue # continues to the next line
 
+    if updates: # checks if any line produced a write
+        try: # attempts to write every parsed line at once
+            inventory_manager.update_drawers_bulk(updates, cabinet) # writes all drawers in one transaction
+        except Exception as e: # catches any exception during the bulk write
+            Logger.error("failed to write bulk update for cabinet '%s': %s", cabinet, e) # logs an error message
+
+    _invalidate(cabinet) # the cabinet's cached data is now outdated
     return redirect(f"/?cabinet={cabinet}") # redirects back to the main page for the current cabinet
 
 @app.route('/api/inventory') # defines the route for retrieving inventory data via API
+@safe_route("failed to retrieve inventory data") # answers with a 500 JSON error if the inventory cannot be loaded
 def get_inventory_api():
     """retrieves and returns inventory data as JSON, with ETag caching.
 
@@ -281,29 +365,42 @@ def get_inventory_api():
     Returns:
         flask.Response: a JSON response containing inventory data, a 304 Not Modified response, or an error.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    try: # attempts to retrieve and process inventory data
-        inventory = inventory_manager.get_inventory(cabinet) # retrieves the inventory for the specified cabinet
-        inventory = pad_inventory(inventory) # pads the inventory
-        inventory_json = json.dumps(inventory, sort_keys=True) # converts the inventory dictionary to a JSON string, sorted by keys
-        etag = hashlib.md5(inventory_json.encode()).hexdigest() # generates an ETag based on the MD5 hash of the JSON string
-
-        if_none_match = request.headers.get('If-None-Match') # gets the 'If-None-Match' header from the request
-        if if_none_match == etag: # checks if the client's ETag matches the current ETag
-            Logger.debug(f"etag matched for cabinet '{cabinet}', returning 304") # logs a debug message for ETag match
-            return '', 304 # returns an empty response with a 304 Not Modified status
-
-        Logger.debug(f"returning inventory json for cabinet '{cabinet}' with etag {etag}") # logs a debug message for returning new data
+    cabinet = g.cabinet # cabinet parsed by _parse_cabinet
+    entry = _api_cache.get(cabinet) # looks up the cached json, etag and compressed json for this cabinet
+    if_none_match = request.headers.get('If-None-Match') # gets the 'If-None-Match' header from the request
+    if entry is not None and if_none_match == entry[1]: # checks the client's ETag against the cache before doing any other work
+        return '', 304 # returns an empty response with a 304 Not Modified status
+    if entry is None: # checks if the cabinet is not cached yet or was invalidated
+        with _api_cache_lock: # reads the generation consistently
+            generation = _api_cache_generation # remembers which generation this result belongs to
+        inventory = inventory_manager.get_padded_inventory(cabinet) # retrieves the inventory for the specified cabinet, padded by sqlite
+        inventory_json = orjson.dumps(inventory, option=orjson.OPT_SORT_KEYS) # converts the inventory dictionary to JSON bytes, sorted by keys
+        etag = base64.urlsafe_b64encode(hashlib.blake2b(inventory_json, digest_size=16).digest()).rstrip(b'=').decode() # generates a 22 character ETag from the raw 128-bit BLAKE2b hash of the JSON bytes
+        gzipped = gzip.compress(inventory_json, 6) if len(inventory_json) > 1024 else None # compresses once per change instead of once per request
+        entry = (inventory_json, etag, gzipped) # pairs the body with its etag and compressed form
+        with _api_cache_lock: # stores the result unless a write happened meanwhile
+            if generation == _api_cache_generation: # checks if no invalidation ran during the computation
+                _api_cache[cabinet] = entry # caches the result for later requests
+    inventory_json, etag, gzipped = entry # unpacks the cached or freshly computed entry
+
+    if if_none_match == etag: # checks if the client's ETag matches the freshly computed ETag
+        Logger.debug("etag matched for cabinet '%s', returning 304", cabinet) # logs a debug message for ETag match
+        return '', 304 # returns an empty response with a 304 Not Modified status
+
+    Logger.debug("returning inventory json for cabinet '%s' with etag %s", cabinet, etag) # logs a debug message for returning new data
+    if gzipped is not None and request.accept_encodings['gzip']: # checks if the client can take the precompressed body
+        response = make_response(gzipped) # creates a Flask response object with the compressed JSON data
+        response.headers['Content-Encoding'] = 'gzip' # tells the client to decompress the body
+    else: # the client gets the JSON as it is
         response = make_response(inventory_json) # creates a Flask response object with the JSON data
-        response.headers['Content-Type'] = 'application/json' # sets the content type header to application/json
-        response.headers['ETag'] = etag # sets the ETag header
-        response.headers['Cache-Control'] = 'public, max-age=300' # sets cache control headers
-        return response # returns the response
-    except Exception as e: # catches any exception during API data retrieval
-        Logger.error(f"failed to get inventory api data for cabinet '{cabinet}': {e}") # logs an error message
-        return jsonify(error="failed to retrieve inventory data"), 500 # returns a JSON error response with a 500 status code
+    response.headers['Content-Type'] = 'application/json' # sets the content type header to application/json
+    response.headers['Vary'] = 'Accept-Encoding' # caches must keep the compressed and plain bodies apart
+    response.headers['ETag'] = etag # sets the ETag header
+    response.headers['Cache-Control'] = 'public, max-age=300' # sets cache control headers
+    return response # returns the response
 
 @app.route('/export/csv') # defines the route for exporting inventory to CSV
+@safe_route("failed to export csv") # answers with a 500 JSON error if the export raises
 def export_csv():
     """exports the inventory for a specific cabinet to a CSV file.
 
@@ -313,31 +410,24 @@ def export_csv():
     Returns:
         flask.Response: a file response for the CSV download or an error JSON.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    try: # attempts to export to CSV
-        return export_manager.export_csv(cabinet) # calls the export_csv method of the export manager
-    except Exception as e: # catches any exception during export
-        Logger.error(f"export csv failed for cabinet '{cabinet}': {e}") # logs an error message
-        return jsonify(error="failed to export csv"), 500 # returns a JSON error response with a 500 status code
+    return export_manager.export_csv(g.cabinet) # calls the export_csv method of the export manager
 
 @app.route('/export/json') # defines the route for exporting inventory to JSON
+@safe_route("failed to export json") # answers with a 500 JSON error if the export raises
 def export_json():
     """exports the inventory for a specific cabinet to a JSON file.
 
     Args:
         cabinet (str, optional): the name of the cabinet to export. Defaults to 'Default'.
+        format (str, optional): 'table' for the columnar layout, anything else for an object keyed by drawer ID. Defaults to 'dict'.
 
     Returns:
         flask.Response: a file response for the JSON download or an error JSON.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    try: # attempts to export to JSON
-        return export_manager.export_json(cabinet) # calls the export_json method of the export manager
-    except Exception as e: # catches any exception during export
-        Logger.error(f"export json failed for cabinet '{cabinet}': {e}") # logs an error message
-        return jsonify(error="failed to export json"), 500 # returns a JSON error response with a 500 status code
+    return export_manager.export_json(g.cabinet, request.args.get('format', 'dict')) # calls the export_json method of the export manager
 
 @app.route('/export/txt') # defines the route for exporting inventory to TXT
+@safe_route("failed to export txt") # answers with a 500 JSON error if the export raises
 def export_txt():
     """exports the inventory for a specific cabinet to a plain text file.
 
@@ -347,14 +437,10 @@ def export_txt():
     Returns:
         flask.Response: a file response for the TXT download or an error JSON.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    try: # attempts to export to TXT
-        return export_manager.export_txt(cabinet) # calls the export_txt method of the export manager
-    except Exception as e: # catches any exception during export
-        Logger.error(f"export txt failed for cabinet '{cabinet}': {e}") # logs an error message
-        return jsonify(error="failed to export txt"), 500 # returns a JSON error response with a 500 status code
+    return export_manager.export_txt(g.cabinet) # calls the export_txt method of the export manager
 
 @app.route('/export/excel') # defines the route for exporting inventory to Excel
+@safe_route("failed to export excel") # answers with a 500 JSON error if the export raises
 def export_excel():
     """exports the inventory for a specific cabinet to an Excel (XLSX) file.
 
@@ -364,49 +450,76 @@ def export_excel():
     Returns:
         flask.Response: a file response for the Excel download or an error JSON.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    try: # attempts to export to Excel
-        return export_manager.export_excel(cabinet) # calls the export_excel method of the export manager
-    except Exception as e: # catches any exception during export
-        Logger.error(f"export excel failed for cabinet '{cabinet}': {e}") # logs an error message
-        return jsonify(error="failed to export excel"), 500 # returns a JSON error response with a 500 status code
+    return export_manager.export_excel(g.cabinet) # calls the export_excel method of the export manager
+
+@app.route('/export/parquet') # defines the route for exporting inventory to Parquet
+@safe_route("failed to export parquet") # answers with a 500 JSON error if the export raises
+def export_parquet():
+    """exports the inventory for a specific cabinet to a Parquet file.
+
+    Args:
+        cabinet (str, optional): the name of the cabinet to export. Defaults to 'Default'.
+
+    Returns:
+        flask.Response: a file response for the Parquet download or an error JSON.
+    """
+    return export_manager.export_parquet(g.cabinet) # calls the export_parquet method of the export manager
 
 @app.route('/export/sheets') # defines the route for exporting inventory to Google Sheets
+@safe_route("failed to export sheets") # answers with a 500 JSON error if the call raises
 def export_sheets():
     """handles the request for exporting inventory to Google Sheets (currently not implemented).
 
     Returns:
         flask.Response: a JSON response indicating that the feature is not implemented.
     """
-    try: # attempts to call the export_sheets method
-        return export_manager.export_sheets() # calls the export_sheets method of the export manager
-    except Exception as e: # catches any exception during the call
-        Logger.error(f"export sheets failed: {e}") # logs an error message
-        return jsonify(error="failed to export sheets"), 500 # returns a JSON error response with a 500 status code
+    return export_manager.export_sheets() # calls the export_sheets method of the export manager
 
-@app.route('/import/csv', methods=['POST']) # defines the route for importing CSV files
-def import_csv():
-    """imports inventory data from an uploaded CSV file.
+IMPORT_HANDLERS = { # file extension -> (import format, import method)
+    '.csv': ('csv', import_manager.import_csv),
+    '.json': ('json', import_manager.import_json),
+    '.txt': ('txt', import_manager.import_txt),
+    '.xlsx': ('excel', import_manager.import_excel),
+    '.xls': ('excel', import_manager.import_excel),
+    '.parquet': ('parquet', import_manager.import_parquet),
+    '.feather': ('parquet', import_manager.import_parquet),
+}
+
+def _import_upload(fmt):
+    """checks the uploaded file and passes it to the import method for its extension.
+
+    Args:
+        fmt (str): the import format the route accepts ('csv', 'json', 'txt', 'excel' or 'parquet').
 
     Returns:
         flask.Response: a JSON response indicating success or failure of the import.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    if 'file' not in request.files: # checks if no file was uploaded
-        Logger.warning("no file part in csv import request") # logs a warning
+    cabinet = g.cabinet # cabinet parsed by _parse_cabinet
+    file = request.files.get('file') # gets the uploaded file if there is one
+    if file is None: # checks if no file was uploaded
+        Logger.warning("no file part in %s import request", fmt) # logs a warning
         return jsonify(success=False, error="no file part"), 400 # returns an error response
-    file = request.files['file'] # gets the uploaded file
     if file.filename == '': # checks if the filename is empty
-        Logger.warning("no selected file for csv import") # logs a warning
+        Logger.warning("no selected file for %s import", fmt) # logs a warning
         return jsonify(success=False, error="no selected file"), 400 # returns an error response
-    if file and file.filename.endswith('.csv'): # checks if a file exists and has a .csv extension
-        success = import_manager.import_csv(file, cabinet) # calls the import_csv method of the import manager
-        if success: # if import was successful
-            return jsonify(success=True) # returns success
-        else: # if import failed
-            return jsonify(success=False, error="failed to import csv"), 500 # returns an error
-    Logger.warning(f"invalid file type for csv import: {file.filename}") # logs a warning for invalid file type
-    return jsonify(success=False, error="invalid file type"), 400 # returns an error for invalid file type
+    handler = IMPORT_HANDLERS.get(os.path.splitext(file.filename)[1].lower()) # looks up the importer for the file extension
+    if handler is None or handler[0] != fmt: # checks if the extension doesn't belong to this route's format
+        Logger.warning("invalid file type for %s import: %s", fmt, file.filename) # logs a warning for invalid file type
+        return jsonify(success=False, error="invalid file type"), 400 # returns an error for invalid file type
+    success = handler[1](file, cabinet) # calls the matching import method of the import manager
+    _invalidate(cabinet) # rows may have been written even if the import failed part way
+    if success: # if import was successful
+        return jsonify(success=True) # returns success
+    return jsonify(success=False, error=f"failed to import {fmt}"), 500 # returns an error
+
+@app.route('/import/csv', methods=['POST']) # defines the route for importing CSV files
+def import_csv():
+    """imports inventory data from an uploaded CSV file.
+
+    Returns:
+        flask.Response: a JSON response indicating success or failure of the import.
+    """
+    return _import_upload('csv') # checks and imports the uploaded file
 
 @app.route('/import/json', methods=['POST']) # defines the route for importing JSON files
 def import_json():
@@ -415,22 +528,7 @@ def import_json():
     Returns:
         flask.Response: a JSON response indicating success or failure of the import.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    if 'file' not in request.files: # checks if no file was uploaded
-        Logger.warning("no file part in json import request") # logs a warning
-        return jsonify(success=False, error="no file part"), 400 # returns an error response
-    file = request.files['file'] # gets the uploaded file
-    if file.filename == '': # checks if the filename is empty
-        Logger.warning("no selected file for json import") # logs a warning
-        return jsonify(success=False, error="no selected file"), 400 # returns an error response
-    if file and file.filename.endswith('.json'): # checks if a file exists and has a .json extension
-        success = import_manager.import_json(file, cabinet) # calls the import_json method of the import manager
-        if success: # if import was successful
-            return jsonify(success=True) # returns success
-        else: # if import failed
-            return jsonify(success=False, error="failed to import json"), 500 # returns an error
-    Logger.warning(f"invalid file type for json import: {file.filename}") # logs a warning for invalid file type
-    return jsonify(success=False, error="invalid file type"), 400 # returns an error for invalid file type
+    return _import_upload('json') # checks and imports the uploaded file
 
 @app.route('/import/txt', methods=['POST']) # defines the route for importing TXT files
 def import_txt():
@@ -439,22 +537,7 @@ def import_txt():
     Returns:
         flask.Response: a JSON response indicating success or failure of the import.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    if 'file' not in request.files: # checks if no file was uploaded
-        Logger.warning("no file part in txt import request") # logs a warning
-        return jsonify(success=False, error="no file part"), 400 # returns an error response
-    file = request.files['file'] # gets the uploaded file
-    if file.filename == '': # checks if the filename is empty
-        Logger.warning("no selected file for txt import") # logs a warning
-        return jsonify(success=False, error="no selected file"), 400 # returns an error response
-    if file and file.filename.endswith('.txt'): # checks if a file exists and has a .txt extension
-        success = import_manager.import_txt(file, cabinet) # calls the import_txt method of the import manager
-        if success: # if import was successful
-            return jsonify(success=True) # returns success
-        else: # if import failed
-            return jsonify(success=False, error="failed to import txt"), 500 # returns an error
-    Logger.warning(f"invalid file type for txt import: {file.filename}") # logs a warning for invalid file type
-    return jsonify(success=False, error="invalid file type"), 400 # returns an error for invalid file type
+    return _import_upload('txt') # checks and imports the uploaded file
 
 @app.route('/import/excel', methods=['POST']) # defines the route for importing Excel files
 def import_excel():
@@ -463,62 +546,115 @@ def import_excel():
     Returns:
         flask.Response: a JSON response indicating success or failure of the import.
     """
-    cabinet = request.args.get('cabinet', 'Default') # gets the 'cabinet' query parameter, defaulting to 'Default'
-    if 'file' not in request.files: # checks if no file was uploaded
-        Logger.warning("no file part in excel import request") # logs a warning
-        return jsonify(success=False, error="no file part"), 400 # returns an error response
-    file = request.files['file'] # gets the uploaded file
-    if file.filename == '': # checks if the filename is empty
-        Logger.warning("no selected file for excel import") # logs a warning
-        return jsonify(success=False, error="no selected file"), 400 # returns an error response
-    if file and (file.filename.endswith('.xlsx') or file.filename.endswith('.xls')): # checks if a file exists and has an Excel extension
-        success = import_manager.import_excel(file, cabinet) # calls the import_excel method of the import manager
-        if success: # if import was successful
-            return jsonify(success=True) # returns success
-        else: # if import failed
-            return jsonify(success=False, error="failed to import excel"), 500 # returns an error
-    Logger.warning(f"invalid file type for excel import: {file.filename}") # logs a warning for invalid file type
-    return jsonify(success=False, error="invalid file type"), 400 # returns an error for invalid file type
-
+    return _import_upload('excel') # checks and imports the uploaded file
 
-def periodic_backup(interval_seconds=300):
-    """performs a periodic backup of the entire inventory to a CSV file.
+@app.route('/import/parquet', methods=['POST']) # defines the route for importing Parquet and Feather files
+def import_parquet():
+    """imports inventory data from an uploaded Parquet or Feather file.
 
-    Args:
-        interval_seconds (int, optional): the interval in seconds between backups. Defaults to 300 (5 minutes).
+    Returns:
+        flask.Response: a JSON response indicating success or failure of the import.
     """
-    while True: # runs indefinitely
-        try: # handles errors during the backup process
-            backup_file = os.path.join(PROJECT_ROOT, 'resources', 'backup.csv') # constructs the full path to the backup CSV file
+    return _import_upload('parquet') # checks and imports the uploaded file
 
-            cabinets = inventory_manager.get_all_cabinets() # retrieves all cabinet names
-            if not cabinets: # checks if no cabinets were found
-                Logger.warning("no cabinets found during backup, creating 'default' if none exist") # logs a warning if no cabinets are found
+def _backup_rows(cabinet):
+    """renders one cabinet's padded inventory as backup CSV rows.
 
-            with open(backup_file, 'w', newline='', encoding='utf-8') as csvfile: # opens the backup file in write mode
-                writer = csv.writer(csvfile) # creates a CSV writer object
-                writer.writerow(['Cabinet', 'Drawer', 'Name', 'Quantity']) # writes the header row to the backup file
+    Args:
+        cabinet (str): the name of the cabinet.
 
-                for cabinet in cabinets: # iterates through each cabinet
-                    try: # handles errors for individual cabinet backup
-                        inventory = inventory_manager.get_inventory(cabinet) # retrieves the inventory for the current cabinet
-                        padded_inventory = pad_inventory(inventory) # pads the inventory
+    Returns:
+        str: the cabinet's rows in CSV format, without the header.
+    """
+    inventory = inventory_manager.get_inventory(cabinet) # retrieves the inventory for the current cabinet
+    prefix = csv_escape(cabinet) + ',' # the cabinet column is the same on every row
+    return ''.join([f"{prefix}{csv_escape(drawer)},{csv_escape(name)},{qty}\r\n" for drawer, name, qty in pad_inventory_iter(inventory)]) # formats every padded drawer and joins them once
 
-                        for drawer, data in padded_inventory.items(): # iterates through each drawer in the padded inventory
-                            writer.writerow([cabinet, drawer, data.get('name', ''), data.get('qty', 0)]) # writes drawer data to the CSV
-                    except Exception as e: # catches any exception during a single cabinet backup
-                        Logger.error(f"failed to backup cabinet '{cabinet}': {e}") # logs an error for the failed cabinet backup
+def _write_backup(dirty):
+    """rewrites the backup CSV, re-reading only the cabinets that changed since the last backup.
 
-            Logger.info(f"backed up full inventory to {backup_file}") # logs a success message for the full backup
+    Args:
+        dirty (set): the cabinets that changed, None in the set means every cabinet.
+    """
+    backup_file = os.path.join(PROJECT_ROOT, 'resources', 'backup.csv') # constructs the full path to the backup CSV file
+
+    cabinets = inventory_manager.get_all_cabinets() # retrieves all cabinet names
+    if not cabinets: # checks if no cabinets were found
+        Logger.warning("no cabinets found during backup, creating 'default' if none exist") # logs a warning if no cabinets are found
+
+    for cabinet in list(_backup_sections): # forgets cabinets that no longer exist
+        if cabinet not in cabinets: # cabinet was emptied out of the database
+            del _backup_sections[cabinet] # drops its rows
+
+    stale = [cabinet for cabinet in cabinets if None in dirty or cabinet in dirty or cabinet not in _backup_sections] # cabinets whose rows must be rendered again
+    if stale: # checks if anything changed
+        with ThreadPoolExecutor(max_workers=min(4, len(stale))) as pool: # reads several cabinets at once, leaving pooled connections for requests
+            futures = {cabinet: pool.submit(_backup_rows, cabinet) for cabinet in stale} # starts every read
+            for cabinet, future in futures.items(): # collects them in cabinet order
+                try: # handles errors for individual cabinet backup
+                    _backup_sections[cabinet] = future.result() # stores the rendered rows
+                except Exception as e: # catches any exception during a single cabinet backup
+                    _backup_sections.pop(cabinet, None) # leaves the cabinet out rather than writing stale rows
+                    Logger.error("failed to backup cabinet '%s': %s", cabinet, e) # logs an error for the failed cabinet backup
+
+    body = 'Cabinet,Drawer,Name,Quantity\r\n' + ''.join(_backup_sections.get(cabinet, '') for cabinet in cabinets) # header followed by every cabinet in order
+    temp_file = backup_file + '.tmp' # written next to the backup so the rename stays on one filesystem
+    with open(temp_file, 'wb') as f: # opens the temporary file in binary mode
+        f.write(body.encode('utf-8')) # single write for the whole backup
+        f.flush() # hands the bytes to the OS
+        os.fsync(f.fileno()) # one sync at the end instead of none or per row
+    os.replace(temp_file, backup_file) # atomic swap, readers never see a half written backup
+
+    Logger.info("backed up full inventory to %s", backup_file) # logs a success message for the full backup
+
+def periodic_backup(debounce_seconds=2, max_delay_seconds=300):
+    """writes the backup CSV whenever the inventory changes, coalescing bursts of writes.
+
+    the first backup covers every cabinet. after that the thread sleeps until _invalidate reports a change,
+    then waits for the writes to go quiet before backing up the changed cabinets.
 
-        except Exception as e: # catches any broader exception during the backup loop
-            Logger.error(f"backup failed: {e}") # logs a general backup failure message
+    Args:
+        debounce_seconds (int, optional): how long the inventory must stay unchanged before a backup. Defaults to 2.
+        max_delay_seconds (int, optional): longest a change may wait while writes keep arriving. Defaults to 300 (5 minutes).
+    """
+    dirty = {None} # the first pass backs up every cabinet
+    first_change = time.monotonic() # when the oldest unsaved change arrived
+    wait = 0 # back up right away on startup
+    while True: # runs indefinitely
+        try: # waits for the next change
+            cabinet = _backup_queue.get(timeout=wait if dirty else None) # blocks with no timeout while nothing is unsaved
+            if not dirty: # first change since the last backup
+                first_change = time.monotonic() # starts the max delay clock
+            dirty.add(cabinet) # remembers the cabinet
+            if time.monotonic() - first_change < max_delay_seconds: # still allowed to wait for more writes
+                wait = debounce_seconds # restarts the quiet period
+                continue # keeps collecting changes
+        except queue.Empty: # writes went quiet
+            pass # falls through to the backup
 
-        time.sleep(interval_seconds) # pauses execution for the specified interval
+        try: # handles errors during the backup process
+            _write_backup(dirty) # rewrites the backup file
+            dirty.clear() # everything is saved
+        except Exception as e: # catches any broader exception during the backup
+            Logger.error("backup failed: %s", e) # logs a general backup failure message
+            wait = max_delay_seconds # retries later instead of spinning on the same error
+
+def _start_backup():
+    """starts the background backup thread unless it is already running.
+    """
+    global _backup_started
+    with _backup_lock: # only one caller may start the thread
+        if _backup_started: # checks if the backup thread is already running
+            return # nothing to do
+        _backup_started = True # marks the backup thread as started, changes are queued from here on
+    threading.Thread(target=periodic_backup, daemon=True).start() # backs up after each burst of changes
 
 if __name__ == '__main__': # checks if the script is being run directly
-    backup_thread = threading.Thread(target=periodic_backup, args=(300,), daemon=True) # creates a new thread for periodic backup
-    backup_thread.start() # starts the backup thread
-
-    Logger.info("starting flask app on 0.0.0.0:5000") # logs that the Flask app is starting
-    app.run(host='0.0.0.0', port=5000, debug=True) # runs the Flask application
\ No newline at end of file
+    _start_backup() # starts the backup thread
+
+    if os.environ.get('FLASK_ENV') == 'development': # the werkzeug server is only for local debugging
+        Logger.info("starting the flask development server on 0.0.0.0:5000") # logs that the server is starting
+        app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False) # no reloader, it would start a second backup thread
+    else: # everything else gets the production server
+        Logger.info("starting waitress on 0.0.0.0:5000 with 8 threads") # logs that the server is starting
+        serve(app, host='0.0.0.0', port=5000, threads=8) # handles requests on a pool of 8 threads, matching the inventory connection pool
\ No newline at end of file
@@ -1,11 +1,56 @@
 import io
-import csv
-import json
+import orjson
 import pandas as pd
-from utilities import pad_inventory
-from flask import send_file, Response, jsonify
+from itertools import islice
+from openpyxl import Workbook
+from utilities import pad_inventory_iter, gzip_stream, csv_escape
+from flask import send_file, Response, jsonify, request
 from Logger import Logger
 
+try: # xlsxwriter writes each row out as it is added and is faster than openpyxl
+    import xlsxwriter
+except ImportError: # not installed
+    xlsxwriter = None # fall back to openpyxl's write-only mode
+
+def _chunked(pieces, empty, size=256):
+    """joins streamed pieces into larger chunks so the server writes a few blocks instead of one per row.
+
+    Args:
+        pieces (iterable): the str or bytes pieces to join.
+        empty (str or bytes): an empty value of the same type, used to join them.
+        size (int, optional): how many pieces go into each chunk. Defaults to 256.
+
+    Yields:
+        str or bytes: up to size pieces joined together.
+    """
+    pieces = iter(pieces) # islice needs to keep consuming the same iterator
+    while True: # runs until the pieces are used up
+        chunk = empty.join(islice(pieces, size)) # joins the next batch without an intermediate list
+        if not chunk: # checks if nothing was left
+            return # ends the stream
+        yield chunk # sends the batch
+
+def _stream(pieces, empty, mimetype, filename):
+    """builds a streaming download response, gzip compressed when the client accepts it.
+
+    Args:
+        pieces (iterable): the str or bytes pieces of the file.
+        empty (str or bytes): an empty value of the same type, used to join them.
+        mimetype (str): the MIME type of the file.
+        filename (str): the suggested download filename.
+
+    Returns:
+        flask.Response: a Flask response streaming the file as an attachment.
+    """
+    chunks = _chunked(pieces, empty) # groups rows into larger writes
+    headers = {"Content-Disposition": f"attachment;filename={filename}", "Vary": "Accept-Encoding"} # download name, caches must key on the encoding
+    if request.accept_encodings['gzip']: # checks if the client can decompress the body
+        if isinstance(empty, str): # text pieces have to be encoded before compressing
+            chunks = (chunk.encode('utf-8') for chunk in chunks) # encodes each chunk as it is sent
+        headers["Content-Encoding"] = "gzip" # tells the client to decompress the body
+        return Response(gzip_stream(chunks), mimetype=mimetype, headers=headers) # compresses while streaming
+    return Response(chunks, mimetype=mimetype, headers=headers) # streams the file as it is
+
 class ExportManager:
     """handles the process of exporting the data to a specific file type.
     """
@@ -19,6 +64,68 @@ class ExportManager:
         self.inventory_manager = inventory_manager # initializes the inventory manager instance
         self.pad_inventory = pad_func # initializes the pad function
 
+    def iter_csv(self, drawers):
+        """yields the CSV export of an inventory one row at a time.
+
+        Args:
+            drawers (iterable): (drawer_id, name, qty) tuples, as given by pad_inventory_iter.
+
+        Yields:
+            str: the header row followed by one row per drawer.
+        """
+        yield 'ID,Name,Quantity\r\n' # header row
+        for key, name, qty in drawers: # iterates through each item in the inventory
+            yield f"{csv_escape(key)},{csv_escape(name)},{qty}\r\n" # each item's ID, name, and quantity
+
+    def iter_json(self, drawers):
+        """yields the JSON export of an inventory one drawer at a time.
+
+        Args:
+            drawers (iterable): (drawer_id, name, qty) tuples, as given by pad_inventory_iter.
+
+        Yields:
+            bytes: the opening brace, one entry per drawer, and the closing brace.
+        """
+        yield b"{\n" # opens the object
+        sep = b"  " # the first drawer has no comma in front of it
+        for key, name, qty in drawers: # iterates through each item in the inventory
+            yield sep + orjson.dumps(key) + b": " + orjson.dumps({"name": name, "qty": qty}, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ") # same layout json.dumps(indent=2) gave the whole file
+            sep = b",\n  " # separates the following drawers
+        yield b"\n}" # closes the object
+
+    def iter_json_table(self, drawers):
+        """yields the columnar JSON export of an inventory one drawer at a time.
+
+        The file is {"__dict_type": "table", "cols": ["id", "name", "qty"], "row_data": [[id, name, qty], ...]},
+        which leaves out the field names repeated for every drawer. import_json accepts it as well.
+
+        Args:
+            drawers (iterable): (drawer_id, name, qty) tuples, as given by pad_inventory_iter.
+
+        Yields:
+            bytes: the table header, one row per drawer, and the closing brackets.
+        """
+        yield b'{"__dict_type": "table", "cols": ["id", "name", "qty"], "row_data": [\n' # opens the table
+        sep = b"  " # the first row has no comma in front of it
+        for drawer in drawers: # iterates through each item in the inventory
+            yield sep + orjson.dumps(drawer) # one row per line, the tuple is written as a list
+            sep = b",\n  " # separates the following rows
+        yield b"\n]}" # closes the table
+
+    def iter_txt(self, drawers):
+        """yields the plain text export of an inventory one line at a time.
+
+        Args:
+            drawers (iterable): (drawer_id, name, qty) tuples, as given by pad_inventory_iter.
+
+        Yields:
+            str: one "ID: name (qty)" line per drawer, separated by newlines.
+        """
+        sep = "" # the first line has no newline in front of it
+        for key, name, qty in drawers: # iterates through each item in the inventory
+            yield f"{sep}{key}: {name} ({qty})" # formatted line for the drawer
+            sep = "\n" # separates the following lines
+
     def export_csv(self, cabinet):
         """exports the inventory data for a given cabinet to a CSV file.
 
@@ -26,48 +133,35 @@ class ExportManager:
             cabinet (str): the name of the cabinet whose inventory is to be exported.
 
         Returns:
-            flask.Response: a Flask response containing the CSV file as an attachment.
+            flask.Response: a Flask response streaming the CSV file as an attachment.
             flask.Response: an error response if the export fails.
         """
         try: # handles errors during the export process
-            inventory = self.pad_inventory(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet and pads it
-            output = io.StringIO() # creates an in-memory text buffer
-            writer = csv.writer(output) # creates a CSV writer object for the buffer
-            writer.writerow(['ID', 'Name', 'Quantity']) # writes the header row to the CSV
-            for key, value in inventory.items(): # iterates through each item in the inventory
-                writer.writerow([key, value.get('name', ''), value.get('qty', 0)]) # writes each item's ID, name, and quantity to the CSV
-            output.seek(0) # moves the buffer's cursor to the beginning
-            Logger.info(f"csv export successful for cabinet '{cabinet}'") # logs a success message
-            return send_file( # returns the CSV file as a downloadable attachment
-                io.BytesIO(output.getvalue().encode()), # converts the string buffer content to bytes
-                mimetype='text/csv', # sets the MIME type for CSV
-                as_attachment=True, # specifies that the file should be downloaded as an attachment
-                download_name='inventory.csv' # sets the default download filename
-            )
+            drawers = pad_inventory_iter(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet, padded as it is walked
+            Logger.info("csv export successful for cabinet '%s'", cabinet) # logs a success message
+            return _stream(self.iter_csv(drawers), "", 'text/csv', 'inventory.csv') # rows are formatted as they are sent
         except Exception as e: # catches any exception that occurs during export
-            Logger.error(f"csv export failed for cabinet '{cabinet}': {e}") # logs an error message with the exception details
+            Logger.error("csv export failed for cabinet '%s': %s", cabinet, e) # logs an error message with the exception details
             return Response("failed to export csv", status=500) # returns a 500 Internal Server Error response
 
-    def export_json(self, cabinet):
+    def export_json(self, cabinet, layout='dict'):
         """exports the inventory data for a given cabinet to a JSON file.
 
         Args:
             cabinet (str): the name of the cabinet whose inventory is to be exported.
+            layout (str, optional): 'dict' for an object keyed by drawer ID, or 'table' for the columnar layout of iter_json_table. Defaults to 'dict'.
 
         Returns:
-            flask.Response: a Flask response containing the JSON file as an attachment.
+            flask.Response: a Flask response streaming the JSON file as an attachment.
             flask.Response: an error response if the export fails.
         """
         try: # handles errors during the export process
-            inventory = self.pad_inventory(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet and pads it
-            Logger.info(f"json export successful for cabinet '{cabinet}'") # logs a success message
-            return Response( # returns the JSON data as a downloadable attachment
-                json.dumps(inventory, indent=2), # converts the inventory dictionary to a JSON string with 2-space indentation
-                mimetype='application/json', # sets the MIME type for JSON
-                headers={"Content-Disposition": "attachment;filename=inventory.json"} # sets the header to suggest a download filename
-            )
+            drawers = pad_inventory_iter(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet, padded as it is walked
+            Logger.info("json export successful for cabinet '%s'", cabinet) # logs a success message
+            pieces = self.iter_json_table(drawers) if layout == 'table' else self.iter_json(drawers) # picks the requested layout
+            return _stream(pieces, b"", 'application/json', 'inventory.json') # drawers are encoded as they are sent
         except Exception as e: # catches any exception that occurs during export
-            Logger.error(f"json export failed for cabinet '{cabinet}': {e}") # logs an error message with the exception details
+            Logger.error("json export failed for cabinet '%s': %s", cabinet, e) # logs an error message with the exception details
             return Response("failed to export json", status=500) # returns a 500 Internal Server Error response
 
     def export_txt(self, cabinet):
@@ -77,20 +171,15 @@ class ExportManager:
             cabinet (str): the name of the cabinet whose inventory is to be exported.
 
         Returns:
-            flask.Response: a Flask response containing the text file as an attachment.
+            flask.Response: a Flask response streaming the text file as an attachment.
             flask.Response: an error response if the export fails.
         """
         try: # handles errors during the export process
-            inventory = self.pad_inventory(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet and pads it
-            lines = [f"{key}: {val.get('name', '')} ({val.get('qty', 0)})" for key, val in inventory.items()] # creates a list of formatted strings for each inventory item
-            Logger.info(f"txt export successful for cabinet '{cabinet}'") # logs a success message
-            return Response( # returns the text data as a downloadable attachment
-                "\n".join(lines), # joins the list of lines into a single string separated by newlines
-                mimetype='text/plain', # sets the MIME type for plain text
-                headers={"Content-Disposition": "attachment;filename=inventory.txt"} # sets the header to suggest a download filename
-            )
+            drawers = pad_inventory_iter(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet, padded as it is walked
+            Logger.info("txt export successful for cabinet '%s'", cabinet) # logs a success message
+            return _stream(self.iter_txt(drawers), "", 'text/plain', 'inventory.txt') # lines are formatted as they are sent
         except Exception as e: # catches any exception that occurs during export
-            Logger.error(f"txt export failed for cabinet '{cabinet}': {e}") # logs an error message with the exception details
+            Logger.error("txt export failed for cabinet '%s': %s", cabinet, e) # logs an error message with the exception details
             return Response("failed to export txt", status=500) # returns a 500 Internal Server Error response
 
     def export_excel(self, cabinet):
@@ -104,16 +193,24 @@ class ExportManager:
             flask.Response: an error response if the export fails.
         """
         try: # handles errors during the export process
-            inventory = self.pad_inventory(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet and pads it
-            df = pd.DataFrame( # creates a pandas DataFrame from the inventory data
-                [(k, v.get('name', ''), v.get('qty', 0)) for k, v in inventory.items()], # list comprehension to format data for DataFrame
-                columns=['ID', 'Name', 'Quantity'] # sets the column names for the DataFrame
-            )
+            drawers = pad_inventory_iter(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet, padded as it is walked
             output = io.BytesIO() # creates an in-memory binary buffer
-            with pd.ExcelWriter(output, engine='openpyxl') as writer: # creates an Excel writer object using openpyxl engine
-                df.to_excel(writer, index=False, sheet_name='Inventory') # writes the DataFrame to the Excel writer, without index and with a sheet name
+            if xlsxwriter is not None: # checks if the faster writer is available
+                workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False}) # flushes each row once the next one starts, names are never turned into links
+                sheet = workbook.add_worksheet('Inventory') # the only sheet in the file
+                sheet.write_row(0, 0, ('ID', 'Name', 'Quantity')) # writes the header row
+                for row, drawer in enumerate(drawers, 1): # iterates through each item in the inventory
+                    sheet.write_row(row, 0, drawer) # writes each item's ID, name, and quantity
+                workbook.close() # writes the finished workbook to the buffer
+            else: # uses openpyxl
+                workbook = Workbook(write_only=True) # streams rows out instead of keeping a cell tree in memory
+                sheet = workbook.create_sheet('Inventory') # the only sheet in the file
+                sheet.append(['ID', 'Name', 'Quantity']) # writes the header row
+                for drawer in drawers: # iterates through each item in the inventory
+                    sheet.append(drawer) # writes each item's ID, name, and quantity
+                workbook.save(output) # writes the finished workbook to the buffer
             output.seek(0) # moves the buffer's cursor to the beginning
-            Logger.info(f"excel export successful for cabinet '{cabinet}'") # logs a success message
+            Logger.info("excel export successful for cabinet '%s'", cabinet) # logs a success message
             return send_file( # returns the Excel file as a downloadable attachment
                 output, # the in-memory binary buffer containing the Excel data
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', # sets the MIME type for XLSX
@@ -121,9 +218,37 @@ class ExportManager:
                 download_name='inventory.xlsx' # sets the default download filename
             )
         except Exception as e: # catches any exception that occurs during export
-            Logger.error(f"excel export failed for cabinet '{cabinet}': {e}") # logs an error message with the exception details
+            Logger.error("excel export failed for cabinet '%s': %s", cabinet, e) # logs an error message with the exception details
             return Response("failed to export excel", status=500) # returns a 500 Internal Server Error response
 
+    def export_parquet(self, cabinet):
+        """exports the inventory data for a given cabinet to a zstd compressed Parquet file.
+
+        Args:
+            cabinet (str): the name of the cabinet whose inventory is to be exported.
+
+        Returns:
+            flask.Response: a Flask response containing the Parquet file as an attachment.
+            flask.Response: an error response if the export fails.
+        """
+        try: # handles errors during the export process
+            drawers = pad_inventory_iter(self.inventory_manager.get_inventory(cabinet)) # gets the inventory for the specified cabinet, padded as it is walked
+            ids, names, qtys = zip(*drawers) # splits the drawers into their three columns in one pass
+            df = pd.DataFrame({'ID': list(ids), 'Name': list(names), 'Quantity': list(qtys)}) # builds each column from a plain list so pandas doesn't inspect every cell
+            output = io.BytesIO() # creates an in-memory binary buffer
+            df.to_parquet(output, engine='pyarrow', compression='zstd', index=False) # writes the table to the buffer
+            output.seek(0) # moves the buffer's cursor to the beginning
+            Logger.info("parquet export successful for cabinet '%s'", cabinet) # logs a success message
+            return send_file( # returns the Parquet file as a downloadable attachment
+                output, # the in-memory binary buffer containing the Parquet data
+                mimetype='application/vnd.apache.parquet', # sets the MIME type for Parquet
+                as_attachment=True, # specifies that the file should be downloaded as an attachment
+                download_name='inventory.parquet' # sets the default download filename
+            )
+        except Exception as e: # catches any exception that occurs during export
+            Logger.error("parquet export failed for cabinet '%s': %s", cabinet, e) # logs an error message with the exception details
+            return Response("failed to export parquet", status=500) # returns a 500 Internal Server Error response
+
     def export_sheets(self):
         """indicates that Google Sheets export functionality is not yet implemented.
 
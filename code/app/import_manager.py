@@ -1,13 +1,56 @@
 import io
+import re
+import heapq
 import csv
 import json
 import pandas as pd
 from utilities import pad_inventory, generate_all_drawer_keys
 from Logger import Logger
 
+_TXT_LINE = re.compile(r'^\s*([^:]+?)\s*:\s*(.*?)\s*\(\s*(-?\d+)\s*\)\s*$') # "id: name (quantity)" in one scan
+
+try: # python-calamine parses xlsx in rust, much faster than openpyxl
+    import python_calamine # only imported to check that pandas can use the calamine engine
+    _EXCEL_ENGINE = 'calamine' # read spreadsheets with calamine
+except ImportError: # not installed
+    _EXCEL_ENGINE = None # let pandas pick its default engine
+
+try: # ijson reads json uploads incrementally instead of building the whole document
+    import ijson
+except ImportError: # not installed
+    ijson = None # fall back to json.load
+
+def _drawer_pairs(pairs):
+    """turns the top-level members of a JSON upload into (drawer_id, details) pairs.
+
+    The table export layout is recognised by its "__dict_type": "table" member, which export_json writes first,
+    and its rows are hydrated back into the keyed layout.
+
+    Args:
+        pairs (iterable): the (key, value) members of the top-level JSON object, in file order.
+
+    Yields:
+        tuple: the drawer ID and its details dict.
+    """
+    table = False # set once the table marker has been seen
+    cols = ['id', 'name', 'qty'] # column order of the table rows
+    for key, value in pairs: # iterates through each top-level member
+        if key == '__dict_type': # checks for the layout marker
+            table = value == 'table' # remembers if the rows come as a table
+        elif table and key == 'cols': # column names of each row
+            cols = value # uses the order the file declares
+        elif table and key == 'row_data': # the table rows
+            id_i, name_i, qty_i = cols.index('id'), cols.index('name'), cols.index('qty') # positions of the needed columns
+            for row in value: # iterates through each row
+                yield str(row[id_i]), {'name': row[name_i], 'qty': row[qty_i]} # hydrates the row into the keyed layout
+        else: # a normal drawer entry
+            yield key, value # passes it through
+
 class ImportManager:
     """handles the process of importing data from specific file types into the inventory.
     """
+    BATCH_SIZE = 1000 # parsed rows written per transaction
+
     def __init__(self, inventory_manager, pad_func):
         """constructor for class.
 
@@ -18,6 +61,31 @@ class ImportManager:
         self.inventory_manager = inventory_manager # initializes the inventory manager instance
         self.pad_inventory = pad_func # initializes the pad function
 
+    def _queue(self, batch, drawer_id, name, qty, cabinet):
+        """adds a parsed row to the batch and writes the batch once it is full.
+
+        Args:
+            batch (list): the (drawer_id, name, qty) tuples waiting to be written.
+            drawer_id (str): the ID of the drawer (e.g., "A1").
+            name (str): the new name for the drawer.
+            qty (int): the new quantity for the drawer.
+            cabinet (str): the name of the cabinet to import data into.
+        """
+        batch.append((drawer_id, name, qty)) # queues the row
+        if len(batch) >= self.BATCH_SIZE: # checks if the batch is full
+            self._flush(batch, cabinet) # writes it
+
+    def _flush(self, batch, cabinet):
+        """writes the queued rows in one transaction and empties the batch.
+
+        Args:
+            batch (list): the (drawer_id, name, qty) tuples waiting to be written.
+            cabinet (str): the name of the cabinet to import data into.
+        """
+        if batch: # checks if anything is queued
+            self.inventory_manager.update_drawers_bulk(batch, cabinet) # writes every queued row at once
+            batch.clear() # starts the next batch
+
     def import_csv(self, file, cabinet):
         """imports inventory data from a CSV file into a specific cabinet.
 
@@ -29,43 +97,50 @@ class ImportManager:
             bool: true if import was successful, false otherwise.
         """
         try: # handles errors during the import process
-            stream = io.StringIO(file.stream.read().decode("UTF8")) # reads the file content into a string stream
+            stream = io.TextIOWrapper(file.stream, encoding="utf-8", newline="") # decodes the upload as it is read instead of all at once
             reader = csv.reader(stream) # creates a CSV reader object
             header = next(reader, None) # reads the header row, if any
 
-            # determine column indices
-            id_col, name_col, qty_col = -1, -1, -1 # initializes column indices to -1
-            if header: # if a header exists
-                try: # handles errors during header parsing
-                    id_col = header.index('ID') # finds the index of 'ID' column
-                    name_col = header.index('Name') # finds the index of 'Name' column
-                    qty_col = header.index('Quantity') # finds the index of 'Quantity' column
-                except ValueError: # if a column is not found
+            # determine column indices once, header names are matched case-insensitively
+            columns = {} # lowercased header name -> its first index
+            for index, title in enumerate(header or ()): # walks the header row once
+                columns.setdefault(title.strip().lower(), index) # the first column with a name wins, like header.index
+            id_col, name_col, qty_col = columns.get('id'), columns.get('name'), columns.get('quantity') # header-defined indices, None when missing
+            if id_col is None or name_col is None or qty_col is None: # if headers were not found or incomplete, assume fixed positions
+                if header: # a header was there but didn't name every column
                     Logger.warning("csv header missing expected columns (id, name, quantity). attempting import by position.") # logs a warning
-            
-            if id_col == -1 or name_col == -1 or qty_col == -1: # if headers were not found or incomplete, assume fixed positions
                 Logger.info("importing csv by column position (0:id, 1:name, 2:quantity)") # logs that import is by position
+                id_col, name_col, qty_col = 0, 1, 2 # fixed positions
+            last_col = max(id_col, name_col, qty_col) # rows at least this long take the fast path
+
+            batch = [] # parsed rows waiting to be written
 
             for i, row in enumerate(reader): # iterates through each row in the CSV
                 if not row: # skips empty rows
                     continue # continues to the next row
                 try: # handles errors for individual row processing
-                    drawer_id = row[id_col].strip().upper() if id_col != -1 and len(row) > id_col else row[0].strip().upper() # gets drawer ID from header-defined index or first column
-                    name = row[name_col].strip() if name_col != -1 and len(row) > name_col else row[1].strip() if len(row) > 1 else "" # gets name from header-defined index or second column
-                    qty = int(row[qty_col].strip()) if qty_col != -1 and len(row) > qty_col else int(row[2].strip()) if len(row) > 2 else 0 # gets quantity from header-defined index or third column
-                    
-                    self.inventory_manager.update_drawer(drawer_id, name, qty, cabinet) # updates the drawer in the inventory
+                    if len(row) > last_col: # every column is present, the usual case
+                        drawer_id = row[id_col].strip().upper() # gets drawer ID
+                        name = row[name_col].strip() # gets name
+                        qty = int(row[qty_col].strip()) # gets quantity
+                    else: # short row, missing fields fall back like before
+                        drawer_id = (row[id_col] if len(row) > id_col else row[0]).strip().upper() # gets drawer ID from its column or the first one
+                        name = row[name_col].strip() if len(row) > name_col else "" # gets name, empty when missing
+                        qty = int(row[qty_col].strip()) if len(row) > qty_col else 0 # gets quantity, zero when missing
+
+                    self._queue(batch, drawer_id, name, qty, cabinet) # queues the drawer update
                 except (IndexError, ValueError) as e: # catches errors for malformed rows
-                    Logger.warning(f"skipping malformed csv row {i+1}: '{row}' for cabinet '{cabinet}': {e}") # logs a warning for malformed row
+                    Logger.warning("skipping malformed csv row %s: '%s' for cabinet '%s': %s", i+1, row, cabinet, e) # logs a warning for malformed row
                     continue # continues to the next row
-            Logger.info(f"csv import successful for cabinet '{cabinet}'") # logs a success message
+            self._flush(batch, cabinet) # writes the remaining rows
+            Logger.info("csv import successful for cabinet '%s'", cabinet) # logs a success message
             return True # returns true indicating successful import
         except Exception as e: # catches any exception during import
-            Logger.error(f"csv import failed for cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("csv import failed for cabinet '%s': %s", cabinet, e) # logs an error message
             return False # returns false indicating failed import
 
     def import_json(self, file, cabinet):
-        """imports inventory data from a JSON file into a specific cabinet.
+        """imports inventory data from a JSON file into a specific cabinet, either keyed by drawer ID or in the table export layout.
 
         Args:
             file (werkzeug.datastructures.FileStorage): the uploaded JSON file.
@@ -75,23 +150,32 @@ class ImportManager:
             bool: true if import was successful, false otherwise.
         """
         try: # handles errors during the import process
-            data = json.load(file.stream) # loads JSON data from the file stream
-            if not isinstance(data, dict): # checks if the loaded data is not a dictionary
-                Logger.error(f"invalid json format for cabinet '{cabinet}': expected a dictionary") # logs an error
+            if ijson is not None: # streams the upload when ijson is installed
+                events = ijson.parse(file.stream) # parse events, read from the upload as needed
+                is_dict = next(events, (None, None, None))[1] == 'start_map' # checks that the document starts with an object
+                members = ijson.kvitems(events, '') if is_dict else None # each top-level member as it is parsed
+            else: # loads the whole document
+                data = json.load(file.stream) # loads JSON data from the file stream
+                is_dict = isinstance(data, dict) # checks that the document is an object
+                members = data.items() if is_dict else None # each top-level member
+            if not is_dict: # checks if the loaded data is not a dictionary
+                Logger.error("invalid json format for cabinet '%s': expected a dictionary", cabinet) # logs an error
                 return False # returns false for invalid format
 
-            for drawer_id, details in data.items(): # iterates through each item in the JSON data
+            batch = [] # parsed entries waiting to be written
+            for drawer_id, details in _drawer_pairs(members): # iterates through each drawer in the JSON data
                 try: # handles errors for individual drawer processing
                     name = details.get('name', '').strip() # gets the name from details
                     qty = int(details.get('qty', 0)) # gets the quantity from details
-                    self.inventory_manager.update_drawer(drawer_id.upper(), name, qty, cabinet) # updates the drawer in the inventory
+                    self._queue(batch, drawer_id.upper(), name, qty, cabinet) # queues the drawer update
                 except (ValueError, TypeError) as e: # catches errors for invalid name or quantity
-                    Logger.warning(f"skipping malformed json entry for drawer '{drawer_id}' in cabinet '{cabinet}': {e}") # logs a warning
+                    Logger.warning("skipping malformed json entry for drawer '%s' in cabinet '%s': %s", drawer_id, cabinet, e) # logs a warning
                     continue # continues to the next entry
-            Logger.info(f"json import successful for cabinet '{cabinet}')") # logs a success message
+            self._flush(batch, cabinet) # writes the remaining entries
+            Logger.info("json import successful for cabinet '%s')", cabinet) # logs a success message
             return True # returns true indicating successful import
         except Exception as e: # catches any exception during import
-            Logger.error(f"json import failed for cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("json import failed for cabinet '%s': %s", cabinet, e) # logs an error message
             return False # returns false indicating failed import
 
     def import_txt(self, file, cabinet):
@@ -106,8 +190,14 @@ class ImportManager:
             bool: true if import was successful, false otherwise.
         """
         try: # handles errors during the import process
-            content = file.stream.read().decode("UTF8") # reads the file content into a string
-            lines = content.splitlines() # splits the content into individual lines
+            lines = io.TextIOWrapper(file.stream, encoding="utf-8") # decodes the upload line by line instead of all at once
+            batch = [] # parsed lines waiting to be written
+            current = self.inventory_manager.get_inventory(cabinet) # stored drawers, kept in step with the queued lines below
+            name_to_id = {} # lowercased name -> first drawer holding it
+            for k, v in current.items(): # single pass over the stored drawers
+                name_to_id.setdefault(v.get('name', '').lower(), k) # first match wins, same as the old linear scan
+            available = [k for k in generate_all_drawer_keys() if k not in current] # keys with no stored drawer
+            heapq.heapify(available) # smallest free key is always on top
 
             for i, line in enumerate(lines): # iterates through each line
                 line = line.strip() # strips whitespace from the line
@@ -117,24 +207,12 @@ class ImportManager:
                 drawer_id, name, qty = None, "", 0 # initializes variables
 
                 # try parsing "id: name (quantity)"
-                if ':' in line and '(' in line and ')' in line: # checks for the specific format
-                    try: # handles errors during parsing
-                        parts = line.split(':') # splits by colon
-                        drawer_id_part = parts[0].strip().upper() # gets drawer id part
-                        name_qty_part = ":".join(parts[1:]).strip() # gets name and quantity part
-                        
-                        name_start = name_qty_part.find('(') # finds the start of quantity
-                        name_end = name_qty_part.rfind(')') # finds the end of quantity
-
-                        if name_start != -1 and name_end != -1 and name_end > name_start: # if quantity is found
-                            name = name_qty_part[:name_start].strip() # extracts name
-                            qty = int(name_qty_part[name_start+1:name_end].strip()) # extracts and converts quantity
-                            drawer_id = drawer_id_part # sets drawer id
-                        else: # if quantity is not found in expected format
-                            Logger.warning(f"txt import: quantity not found in expected format for line {i+1}: '{line}'") # logs a warning
-                    except (ValueError, IndexError) as e: # catches errors during parsing
-                        Logger.warning(f"txt import: failed to parse 'id: name (qty)' format for line {i+1}: '{line}': {e}") # logs a warning
-                
+                match = _TXT_LINE.match(line) # id, name and quantity in a single pass
+                if match: # checks for the specific format
+                    drawer_id = match.group(1).upper() # sets drawer id
+                    name = match.group(2) # sets name
+                    qty = int(match.group(3)) # the pattern only matches digits, so this cannot fail
+
                 # try parsing "id,name,quantity" or "name,quantity"
                 if drawer_id is None: # if not parsed by the first method
                     parts = [p.strip() for p in line.split(',')] # splits by comma
@@ -149,45 +227,53 @@ class ImportManager:
                             potential_qty = int(parts[1]) # sets potential quantity
                             
                             # check if potential_name is an existing drawer id
-                            if potential_name.upper() in self.inventory_manager.get_inventory(cabinet): # if it's an existing drawer id
+                            if potential_name.upper() in current: # if it's an existing drawer id
                                 drawer_id = potential_name.upper() # sets drawer id
-                                name = self.inventory_manager.get_drawer(drawer_id, cabinet).get('name', '') # gets existing name
+                                name = current[drawer_id].get('name', '') # gets existing name
                                 qty = potential_qty # sets quantity
                             else: # if not an existing drawer id, treat as name
                                 # find by name first
-                                current_inventory = self.inventory_manager.get_inventory(cabinet) # gets current inventory
-                                matched_id = next((k for k, v in current_inventory.items() if v.get('name', '').lower() == potential_name.lower()), None) # finds matching drawer by name
+                                key = potential_name.lower() # names are matched case-insensitively
+                                matched_id = name_to_id.get(key) # finds matching drawer by name
+                                if matched_id and current[matched_id].get('name', '').lower() != key: # that drawer was renamed by an earlier line
+                                    matched_id = next((k for k, v in current.items() if v.get('name', '').lower() == key), None) # rescans once for another holder
+                                    if matched_id: # another drawer still has the name
+                                        name_to_id[key] = matched_id # repairs the index
+                                    else: # nobody has it anymore
+                                        del name_to_id[key] # drops the stale entry
                                 if matched_id: # if a match is found
                                     drawer_id = matched_id # sets drawer id
                                     name = potential_name # sets name
                                     qty = potential_qty # sets quantity
                                 else: # if no match by name, try to assign to an unused key
-                                    all_keys = generate_all_drawer_keys() # generates all possible drawer keys
-                                    used_keys = set(current_inventory.keys()) # gets used keys
-                                    available_keys = sorted(list(set(all_keys) - used_keys)) # finds available keys
-                                    if available_keys: # if available keys exist
-                                        drawer_id = available_keys[0] # assigns to the first available key
+                                    while available and available[0] in current: # skips keys taken by earlier lines
+                                        heapq.heappop(available) # discards the used key
+                                    if available: # if available keys exist
+                                        drawer_id = heapq.heappop(available) # assigns to the first available key
                                         name = potential_name # sets name
                                         qty = potential_qty # sets quantity
                                     else: # if no available keys
-                                        Logger.warning(f"txt import: no available drawer id for line {i+1}: '{line}' in cabinet '{cabinet}'") # logs a warning
+                                        Logger.warning("txt import: no available drawer id for line %s: '%s' in cabinet '%s'", i+1, line, cabinet) # logs a warning
                                         continue # skips to the next line
                         else: # if not 2 or 3 parts
-                            Logger.warning(f"txt import: skipping malformed line {i+1}: '{line}' for cabinet '{cabinet}'") # logs a warning
+                            Logger.warning("txt import: skipping malformed line %s: '%s' for cabinet '%s'", i+1, line, cabinet) # logs a warning
                             continue # skips to the next line
                     except (ValueError, IndexError) as e: # catches errors during parsing
-                        Logger.warning(f"txt import: failed to parse comma-separated format for line {i+1}: '{line}': {e}") # logs a warning
+                        Logger.warning("txt import: failed to parse comma-separated format for line %s: '%s': %s", i+1, line, e) # logs a warning
                         continue # skips to the next line
 
                 if drawer_id: # if a drawer id was successfully determined
-                    self.inventory_manager.update_drawer(drawer_id, name, qty, cabinet) # updates the drawer in the inventory
+                    self._queue(batch, drawer_id, name, qty, cabinet) # queues the drawer update
+                    current[drawer_id] = {"name": name, "qty": qty} # later lines see this drawer without re-reading the database
+                    name_to_id.setdefault(name.lower(), drawer_id) # an earlier holder of the name still wins
                 else: # if no drawer id could be determined
-                    Logger.warning(f"txt import: unable to determine drawer id for line {i+1}: '{line}' in cabinet '{cabinet}'") # logs a warning
+                    Logger.warning("txt import: unable to determine drawer id for line %s: '%s' in cabinet '%s'", i+1, line, cabinet) # logs a warning
+            self._flush(batch, cabinet) # writes the remaining lines
             
-            Logger.info(f"txt import successful for cabinet '{cabinet}'") # logs a success message
+            Logger.info("txt import successful for cabinet '%s'", cabinet) # logs a success message
             return True # returns true indicating successful import
         except Exception as e: # catches any exception during import
-            Logger.error(f"txt import failed for cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("txt import failed for cabinet '%s': %s", cabinet, e) # logs an error message
             return False # returns false indicating failed import
 
     def import_excel(self, file, cabinet):
@@ -201,28 +287,62 @@ class ImportManager:
             bool: true if import was successful, false otherwise.
         """
         try: # handles errors during the import process
-            df = pd.read_excel(file.stream) # reads the Excel file into a pandas dataframe
-            
-            # expected columns: 'id', 'name', 'quantity'
-            if not all(col in df.columns for col in ['ID', 'Name', 'Quantity']): # checks if essential columns are missing
-                Logger.error(f"excel import failed for cabinet '{cabinet}': missing required columns (id, name, quantity)") # logs an error
-                return False # returns false for missing columns
+            df = pd.read_excel(file.stream, engine=_EXCEL_ENGINE) # reads the Excel file into a pandas dataframe, with calamine when it is installed
+            return self._import_frame(df, cabinet, 'excel') # writes the rows
+        except Exception as e: # catches any exception during import
+            Logger.error("excel import failed for cabinet '%s': %s", cabinet, e) # logs an error message
+            return False # returns false indicating failed import
 
-            for index, row in df.iterrows(): # iterates through each row in the dataframe
-                try: # handles errors for individual row processing
-                    drawer_id = str(row['ID']).strip().upper() # gets drawer id, converts to string and uppercase
-                    name = str(row['Name']).strip() # strip name
-                    if name.lower() == 'nan': # check if the string representation is 'nan' (case-insensitive)
-                        name = '' # convert to empty string
-                    
-                    qty = int(row['Quantity']) # gets quantity, converts to integer
-                    
-                    self.inventory_manager.update_drawer(drawer_id, name, qty, cabinet) # updates the drawer in the inventory
-                except (ValueError, TypeError) as e: # catches errors for invalid data types in row
-                    Logger.warning(f"skipping malformed excel row {index+1}: {row.to_dict()} for cabinet '{cabinet}': {e}") # logs a warning
-                    continue # continues to the next row
-            Logger.info(f"excel import successful for cabinet '{cabinet}'") # logs a success message
-            return True # returns true indicating successful import
+    def import_parquet(self, file, cabinet):
+        """imports inventory data from a Parquet or Feather file into a specific cabinet.
+
+        both are columnar binary formats, so they load much faster than a spreadsheet and keep their column types.
+
+        Args:
+            file (werkzeug.datastructures.FileStorage): the uploaded .parquet or .feather file.
+            cabinet (str): the name of the cabinet to import data into.
+
+        Returns:
+            bool: true if import was successful, false otherwise.
+        """
+        try: # handles errors during the import process
+            if file.filename.lower().endswith('.feather'): # checks if the upload is a Feather file
+                df = pd.read_feather(file.stream) # reads the Feather file into a pandas dataframe
+            else: # treats anything else as Parquet
+                df = pd.read_parquet(file.stream) # reads the Parquet file into a pandas dataframe
+            return self._import_frame(df, cabinet, 'parquet') # writes the rows
         except Exception as e: # catches any exception during import
-            Logger.error(f"excel import failed for cabinet '{cabinet}': {e}") # logs an error message
-            return False # returns false indicating failed import
\ No newline at end of file
+            Logger.error("parquet import failed for cabinet '%s': %s", cabinet, e) # logs an error message
+            return False # returns false indicating failed import
+
+    def _import_frame(self, df, cabinet, fmt):
+        """writes the rows of a dataframe with 'ID', 'Name' and 'Quantity' columns into a specific cabinet.
+
+        Args:
+            df (pandas.DataFrame): the uploaded table.
+            cabinet (str): the name of the cabinet to import data into.
+            fmt (str): the upload format, used in log messages.
+
+        Returns:
+            bool: true if import was successful, false otherwise.
+        """
+        # expected columns: 'id', 'name', 'quantity'
+        if not all(col in df.columns for col in ['ID', 'Name', 'Quantity']): # checks if essential columns are missing
+            Logger.error("%s import failed for cabinet '%s': missing required columns (id, name, quantity)", fmt, cabinet) # logs an error
+            return False # returns false for missing columns
+
+        ids = df['ID'].map(str).str.strip().str.upper() # drawer ids as uppercase strings, stripped and uppercased for the whole column at once
+        names = df['Name'].fillna('').map(str).str.strip() # stripped names for the whole column, empty cells become empty names
+        names = names.mask(names.str.lower() == 'nan', '') # the text 'nan' becomes an empty name, as str() of an empty cell used to give
+
+        batch = [] # parsed rows waiting to be written
+        for index, (drawer_id, name, raw_qty) in enumerate(zip(ids.tolist(), names.tolist(), df['Quantity'].tolist())): # iterates through plain python values instead of a series per row
+            try: # handles errors for individual row processing
+                qty = int(raw_qty) # converts quantity to integer, empty or text cells raise
+                self._queue(batch, drawer_id, name, qty, cabinet) # queues the drawer update
+            except (ValueError, TypeError) as e: # catches errors for invalid data types in row
+                Logger.warning("skipping malformed %s row %s: %s for cabinet '%s': %s", fmt, index+1, (drawer_id, name, raw_qty), cabinet, e) # logs a warning
+                continue # continues to the next row
+        self._flush(batch, cabinet) # writes the remaining rows
+        Logger.info("%s import successful for cabinet '%s'", fmt, cabinet) # logs a success message
+        return True # returns true indicating successful import
\ No newline at end of file
@@ -1,24 +1,90 @@
 import os
+import queue
 import sqlite3
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from utilities import generate_all_drawer_keys, pad_inventory
 from Logger import Logger
 
+_SEARCH_SQL = ( # matches stored drawers plus the empty drawers padding would add, all inside sqlite, LIKE already ignores ascii case so nothing is lowered per row
+    "WITH keys(row, column) AS (VALUES " + ", ".join(f"('{k[0]}', '{k[1:]}')" for k in generate_all_drawer_keys()) + ") " # every standard drawer position
+    "SELECT row, column, name, qty FROM drawers WHERE cabinet = :cabinet AND ("
+    "row || column LIKE :pattern ESCAPE '\\' OR coalesce(name, '') LIKE :pattern ESCAPE '\\' "
+    "OR CAST(coalesce(qty, 0) AS TEXT) LIKE :pattern ESCAPE '\\') " # stored drawers matching by id, name, or quantity
+    "UNION ALL "
+    "SELECT keys.row, keys.column, '', 0 FROM keys WHERE NOT EXISTS ("
+    "SELECT 1 FROM drawers d WHERE d.cabinet = :cabinet AND d.row = keys.row AND d.column = keys.column) AND ("
+    "keys.row || keys.column LIKE :pattern ESCAPE '\\' OR '' LIKE :pattern ESCAPE '\\' OR '0' LIKE :pattern ESCAPE '\\')" # unstored drawers, which are empty with quantity 0
+)
+
+# the hot statements are kept as constants so every call passes the same text and hits the connection's statement cache
+_INVENTORY_SQL = "SELECT row, column, name, qty FROM drawers WHERE cabinet = ?" # every stored drawer in a cabinet
+_DRAWER_SQL = "SELECT name, qty FROM drawers WHERE row = ? AND column = ? AND cabinet = ?" # one drawer
+_UPSERT_SQL = ( # writes one drawer, updating the stored row in place and leaving it alone when nothing changed
+    "INSERT INTO drawers (cabinet, row, column, name, qty) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (cabinet, row, column) DO UPDATE SET name = excluded.name, qty = excluded.qty "
+    "WHERE name IS NOT excluded.name OR qty IS NOT excluded.qty" # IS NOT so a NULL name or quantity still compares
+)
+_CABINETS_SQL = "SELECT DISTINCT cabinet FROM drawers" # every cabinet with stored drawers
+_PADDED_SQL = ( # every standard drawer in cabinet order, empty when nothing is stored, then stored drawers outside the layout, the same result pad_inventory gives
+    "WITH keys(pos, row, column) AS (VALUES " + ", ".join(f"({i}, '{k[0]}', '{k[1:]}')" for i, k in enumerate(generate_all_drawer_keys())) + ") " # every standard drawer position with its place in the layout
+    "SELECT keys.pos, keys.row, keys.column, coalesce(d.name, ''), coalesce(d.qty, 0) FROM keys "
+    "LEFT JOIN drawers d ON d.cabinet = :cabinet AND d.row = keys.row AND d.column = keys.column " # stored data or an empty drawer, found through the primary key
+    "UNION ALL "
+    "SELECT " + str(len(generate_all_drawer_keys())) + ", row, column, coalesce(name, ''), coalesce(qty, 0) FROM drawers WHERE cabinet = :cabinet "
+    "AND NOT EXISTS (SELECT 1 FROM keys WHERE keys.row = drawers.row AND keys.column = drawers.column) " # drawers outside the layout
+    "ORDER BY 1" # layout order, extra drawers last
+)
+
+@lru_cache(maxsize=256) # only a few dozen drawers exist, so each id is formatted once
+def _drawer_key(row, col):
+    """builds the drawer id for a numeric row (character code) and column.
+
+    Args:
+        row (int): the character code of the drawer row (e.g., 65 for "A").
+        col (int): the column number of the drawer.
+
+    Returns:
+        str: the drawer ID (e.g., "A1").
+    """
+    return f"{chr(row)}{col}" # converts the row code to its letter and appends the column
+
+@lru_cache(maxsize=256) # the same few dozen ids are used over and over, so each is split once
+def _split_id(drawer_id):
+    """splits a drawer id into its row letter and column number, the way they are stored.
+
+    Args:
+        drawer_id (str): the ID of the drawer (e.g., "A1" or "a1").
+
+    Returns:
+        tuple: the uppercase row character and the column number as strings (e.g., ("A", "1")).
+    """
+    return drawer_id[0].upper(), drawer_id[1:] # separates the row character and column number, converting row to uppercase
+
 class InventoryManager:
     """manages inventory data stored in an sqlite database, including CRUD operations, and undo/redo functionality.
     """
-    def __init__(self, db_path=None):
-        """initializes the InventoryManager, setting up the database path and action history.
+    HISTORY_LIMIT = 500 # most undo (and redo) steps kept, a bulk update counts as one step
+
+    def __init__(self, db_path=None, pool_size=8):
+        """initializes the InventoryManager, setting up the database path, connection pool, and action history.
 
         Args:
             db_path (str, optional): the path to the sqlite database file. Defaults to None, which means a default path will be constructed.
+            pool_size (int, optional): how many idle connections are kept open for reuse, normally the server's thread count. Defaults to 8.
         """
         if db_path is None: # checks if a database path was not provided
             base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..')) # gets the absolute path to the parent directory of the current file
             db_path = os.path.join(base_dir, 'resources', 'database.db') # constructs the default database path
         self.db_path = db_path # sets the database path for the instance
-        self.action_history = [] # initializes an empty list to store action history for undo/redo
-        self.redo_stack = [] # initializes an empty list to store actions for redo
-        Logger.info(f"inventorymanager initialized with db path: {self.db_path}") # logs that the inventory manager has been initialized
+        self._pool = queue.Queue(maxsize=pool_size) # idle connections shared by the request threads
+        self.action_history = deque(maxlen=self.HISTORY_LIMIT) # undo steps, each a list of actions, the oldest fall off the end
+        self.redo_stack = deque(maxlen=self.HISTORY_LIMIT) # undone steps waiting to be redone
+        Logger.info("inventorymanager initialized with db path: %s", self.db_path) # logs that the inventory manager has been initialized
         self._initialize_db() # calls a private method to ensure the database and table exist
+        with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+            self._cabinets = {r[0] for r in conn.execute(_CABINETS_SQL) if r[0]} # cabinet names kept in memory, every write below adds to it so the table is only scanned once
 
     def _initialize_db(self):
         """ensures the sqlite database file and the 'drawers' table exist, creating them if necessary.
@@ -27,27 +93,27 @@ class InventoryManager:
             Exception: if there is an error during database initialization.
         """
         try: # handles errors during database initialization
-            conn = self._connect() # establishes a connection to the database
-            c = conn.cursor() # creates a cursor object to execute sql commands
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS drawers (
-                    cabinet TEXT NOT NULL DEFAULT 'Default',
-                    row TEXT NOT NULL,
-                    column TEXT NOT NULL,
-                    name TEXT,
-                    qty INTEGER,
-                    PRIMARY KEY (cabinet, row, column)
-                )
-            ''') # executes a sql command to create the 'drawers' table if it doesn't already exist
-            conn.commit() # commits the transaction to save changes to the database
-            conn.close() # closes the database connection
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                conn.executescript('''
+                    BEGIN IMMEDIATE;
+                    CREATE TABLE IF NOT EXISTS drawers (
+                        cabinet TEXT NOT NULL DEFAULT 'Default',
+                        row TEXT NOT NULL,
+                        column TEXT NOT NULL,
+                        name TEXT,
+                        qty INTEGER,
+                        PRIMARY KEY (cabinet, row, column)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_drawers_cover ON drawers (cabinet, row, column, name, qty);
+                    COMMIT;
+                ''') # creates the 'drawers' table and its covering index if they don't already exist, both in one transaction so startup commits once
             Logger.info("database and 'drawers' table ensured to exist with 'cabinet' column.") # logs a success message
         except Exception as e: # catches any exception that occurs
-            Logger.error(f"error initializing database: {e}") # logs an error message with the exception details
+            Logger.error("error initializing database: %s", e) # logs an error message with the exception details
             raise # re-raises the exception
 
     def _connect(self):
-        """establishes a connection to the sqlite database.
+        """opens a new connection to the sqlite database, set up to be shared between threads.
 
         Raises:
             Exception: if the connection to the database fails.
@@ -57,13 +123,56 @@ class InventoryManager:
         """
         try: # handles errors during database connection
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True) # creates the directory for the database file if it doesn't exist
-            Logger.debug(f"connecting to db at {self.db_path}") # logs a debug message indicating the database path
-            conn = sqlite3.connect(self.db_path) # establishes a connection to the sqlite database
+            Logger.debug("connecting to db at %s", self.db_path) # logs a debug message indicating the database path
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=128) # the connection goes back to the pool and may be used by another thread next, and keeps its compiled statements while it lives
+            conn.execute("PRAGMA journal_mode=WAL") # readers no longer wait for writers
+            conn.execute("PRAGMA synchronous=NORMAL") # wal only needs to sync at checkpoints
+            conn.execute("PRAGMA busy_timeout=5000") # waits up to 5 seconds for a lock instead of failing straight away
+            conn.execute("PRAGMA temp_store=MEMORY") # sorts and temporary tables for the search query stay off disk
+            conn.execute("PRAGMA cache_size=-8000") # about 8MB of page cache per connection, the whole database fits
+            conn.execute("PRAGMA mmap_size=134217728") # reads pages through a 128MB memory map instead of read calls
             return conn # returns the database connection object
         except Exception as e: # catches any exception that occurs during connection
-            Logger.error(f"failed to connect to db: {e}") # logs an error message with the exception details
+            Logger.error("failed to connect to db: %s", e) # logs an error message with the exception details
             raise # re-raises the exception
 
+    @contextmanager
+    def _connection(self):
+        """borrows a connection from the pool for the duration of a with block, opening a new one if none are idle.
+
+        Any transaction left open by a failing block is rolled back before the connection is reused.
+
+        Yields:
+            sqlite3.Connection: a connection object to the sqlite database.
+        """
+        try: # takes an idle connection if there is one
+            conn = self._pool.get_nowait() # reuses an already open connection
+        except queue.Empty: # every pooled connection is in use
+            conn = self._connect() # opens another connection
+        try:
+            yield conn # hands the connection to the with block
+        except Exception: # the block failed part way through
+            conn.rollback() # discards anything it wrote but didn't commit
+            raise # re-raises the exception
+        finally:
+            try: # puts the connection back for the next request
+                self._pool.put_nowait(conn) # keeps the connection open for reuse
+            except queue.Full: # enough connections are already idle
+                conn.close() # closes the extra connection
+
+    def close(self):
+        """closes every idle pooled connection, letting sqlite checkpoint the wal file on shutdown.
+
+        connections borrowed at the time are closed as usual when they are returned to a full pool.
+        """
+        while True: # drains the pool
+            try: # takes the next idle connection
+                conn = self._pool.get_nowait() # removes it from the pool
+            except queue.Empty: # nothing left
+                break # every idle connection is closed
+            conn.close() # closes the connection
+        Logger.info("inventorymanager connections closed") # logs that the pool was drained
+
     def get_inventory(self, cabinet):
         """retrieves the inventory for a specific cabinet from the database.
 
@@ -74,19 +183,48 @@ class InventoryManager:
             dict: a dictionary representing the inventory, with drawer IDs as keys and their details (name, quantity) as values.
         """
         try: # handles errors during inventory retrieval
-            conn = self._connect() # establishes a connection to the database
-            c = conn.cursor() # creates a cursor object
-            c.execute("SELECT row, column, name, qty FROM drawers WHERE cabinet = ?", (cabinet,)) # executes a query to select drawer details for the specified cabinet
-            rows = c.fetchall() # fetches all matching rows
-            conn.close() # closes the database connection
-
-            inventory = {} # initializes an empty dictionary to store the inventory
-            for row, column, name, qty in rows: # iterates through each fetched row
-                key = f"{row}{column}" # constructs the drawer ID (e.g., "A1")
-                inventory[key.upper()] = {"name": name or "", "qty": qty or 0} # adds the drawer to the inventory dictionary, converting key to uppercase and handling potential None values
-            return inventory # returns the constructed inventory dictionary
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                return {f"{row}{column}": {"name": name or "", "qty": qty or 0} for row, column, name, qty in conn.execute(_INVENTORY_SQL, (cabinet,))} # streams the rows into the inventory, rows are stored uppercase so the key needs no conversion, None values become defaults
+        except Exception as e: # catches any exception that occurs
+            Logger.error("error getting inventory for cabinet '%s': %s", cabinet, e) # logs an error message
+            return {} # returns an empty dictionary in case of an error
+
+    def get_padded_inventory(self, cabinet):
+        """retrieves the inventory for a specific cabinet with every drawer present, padded inside sqlite.
+
+        Args:
+            cabinet (str): the name of the cabinet to retrieve inventory for.
+
+        Returns:
+            dict: the same result as pad_inventory(get_inventory(cabinet)), drawer IDs in cabinet order with empty drawers filled in.
+        """
+        try: # handles errors during inventory retrieval
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                rows = conn.execute(_PADDED_SQL, {"cabinet": cabinet}).fetchall() # every drawer, already padded and ordered
+            return {f"{row}{column}": {"name": name, "qty": qty} for _, row, column, name, qty in rows} # builds the inventory in the order sqlite returned it
         except Exception as e: # catches any exception that occurs
-            Logger.error(f"error getting inventory for cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("error getting padded inventory for cabinet '%s': %s", cabinet, e) # logs an error message
+            return pad_inventory({}) # an empty cabinet, like padding the empty result of get_inventory
+
+    def search_inventory(self, cabinet, query):
+        """finds the drawers of a cabinet whose ID, name, or quantity contains the query, including empty drawers.
+
+        Args:
+            cabinet (str): the name of the cabinet to search.
+            query (str): the lowercase text to look for.
+
+        Returns:
+            dict: the matching drawers keyed by drawer ID, in the same form as get_inventory.
+        """
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" # substring pattern with LIKE wildcards in the query escaped
+        try: # handles errors during the search
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                c = conn.cursor() # creates a cursor object
+                c.execute(_SEARCH_SQL, {"cabinet": cabinet, "pattern": pattern}) # filters the drawers inside sqlite
+                rows = c.fetchall() # fetches only the matching rows
+            return {f"{row}{column}": {"name": name or "", "qty": qty or 0} for row, column, name, qty in rows} # builds the result like get_inventory
+        except Exception as e: # catches any exception that occurs
+            Logger.error("error searching inventory for cabinet '%s': %s", cabinet, e) # logs an error message
             return {} # returns an empty dictionary in case of an error
 
     def get_drawer(self, drawer_id, cabinet):
@@ -100,20 +238,19 @@ class InventoryManager:
             dict: a dictionary containing the name and quantity of the drawer, or default empty values if not found or an error occurs.
         """
         if not drawer_id or len(drawer_id) < 2: # checks if the drawer_id is invalid
-            Logger.warning(f"invalid drawer_id provided to get_drawer: '{drawer_id}'") # logs a warning for an invalid drawer ID
+            Logger.warning("invalid drawer_id provided to get_drawer: '%s'", drawer_id) # logs a warning for an invalid drawer ID
             return {"name": "", "qty": 0} # returns default empty values for an invalid ID
-        row, column = drawer_id[0].upper(), drawer_id[1:] # separates the row character and column number from the drawer ID, converting row to uppercase
+        row, column = _split_id(drawer_id) # separates the row character and column number from the drawer ID, converting row to uppercase
         try: # handles errors during drawer retrieval
-            conn = self._connect() # establishes a connection to the database
-            c = conn.cursor() # creates a cursor object
-            c.execute("SELECT name, qty FROM drawers WHERE row = ? AND column = ? AND cabinet = ?", (row, column, cabinet)) # executes a query to select the name and quantity for the specified drawer
-            result_row = c.fetchone() # fetches the first matching row
-            conn.close() # closes the database connection
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                c = conn.cursor() # creates a cursor object
+                c.execute(_DRAWER_SQL, (row, column, cabinet)) # executes a query to select the name and quantity for the specified drawer
+                result_row = c.fetchone() # fetches the first matching row
             if result_row: # checks if a result row was found
                 return {"name": result_row[0] or "", "qty": result_row[1] or 0} # returns the drawer's name and quantity, handling potential None values
             return {"name": "", "qty": 0} # returns default empty values if the drawer is not found
         except Exception as e: # catches any exception that occurs
-            Logger.error(f"error getting drawer '{drawer_id}' in cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("error getting drawer '%s' in cabinet '%s': %s", drawer_id, cabinet, e) # logs an error message
             return {"name": "", "qty": 0} # returns default empty values in case of an error
 
     def _update_drawer_in_db(self, drawer_id, name, qty, cabinet):
@@ -129,20 +266,21 @@ class InventoryManager:
             Exception: if the database update fails.
         """
         if not drawer_id or len(drawer_id) < 2: # checks if the drawer_id is invalid
-            Logger.warning(f"invalid drawer_id provided to _update_drawer_in_db: '{drawer_id}'") # logs a warning for an invalid drawer ID
+            Logger.warning("invalid drawer_id provided to _update_drawer_in_db: '%s'", drawer_id) # logs a warning for an invalid drawer ID
             return # exits the function if the drawer ID is invalid
-        row_char, column_num = drawer_id[0].upper(), drawer_id[1:] # separates the row character and column number, converting row to uppercase
+        row_char, column_num = _split_id(drawer_id) # separates the row character and column number, converting row to uppercase
         try: # handles errors during database update
-            conn = self._connect() # establishes a connection to the database
-            c = conn.cursor() # creates a cursor object
-            c.execute( # executes an sql command to insert or replace a drawer's data
-                "INSERT OR REPLACE INTO drawers (cabinet, row, column, name, qty) VALUES (?, ?, ?, ?, ?)", # sql statement to insert or replace
-                (cabinet, row_char, column_num, name, qty) # parameters for the sql statement
-            )
-            conn.commit() # commits the transaction to save changes
-            conn.close() # closes the database connection
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                c = conn.cursor() # creates a cursor object
+                c.execute( # executes an sql command to insert or update a drawer's data
+                    _UPSERT_SQL, # sql statement to insert or update
+                    (cabinet, row_char, column_num, name, qty) # parameters for the sql statement
+                )
+                conn.commit() # commits the transaction to save changes
+            if cabinet: # empty names are never listed
+                self._cabinets.add(cabinet) # the cabinet now has a stored drawer
         except Exception as e: # catches any exception that occurs
-            Logger.error(f"failed to update drawer '{drawer_id}' in cabinet '{cabinet}' in db: {e}") # logs an error message
+            Logger.error("failed to update drawer '%s' in cabinet '%s' in db: %s", drawer_id, cabinet, e) # logs an error message
             raise # re-raises the exception
 
     def update_drawer(self, drawer_id, new_name, new_qty, cabinet='Default'):
@@ -156,43 +294,128 @@ class InventoryManager:
 
         Raises:
             Exception: if the drawer update operation fails.
+
+        Returns:
+            bool: true if the drawer was written, false if it already held the new name and quantity.
         """
-        Logger.debug(f"attempting to update drawer {drawer_id} in cabinet '{cabinet}' to name '{new_name}', qty {new_qty}") # logs a debug message for the update attempt
+        Logger.debug("attempting to update drawer %s in cabinet '%s' to name '%s', qty %s", drawer_id, cabinet, new_name, new_qty) # logs a debug message for the update attempt
         try: # handles errors during the update process
             old = self.get_drawer(drawer_id, cabinet) # retrieves the current details of the drawer
-            is_new = (old['name'] == '' and old['qty'] == 0) # checks if the drawer is currently empty (considered "new" for action recording)
-
-            action_data = { # prepares a dictionary to store action details
-                'id': drawer_id, # stores the drawer ID
-                'cabinet': cabinet, # stores the cabinet name
-                'prev_name': old['name'], # stores the previous name of the drawer
-                'prev_qty': old['qty'], # stores the previous quantity of the drawer
-                'new_name': new_name, # stores the new name for the drawer
-                'new_qty': new_qty # stores the new quantity for the drawer
-            }
-
-            if is_new: # checks if it's a new drawer being added (from an empty state)
-                action_data['type'] = 'delete' # marks the action type as 'delete' for undo purposes (to revert to empty)
-                Logger.debug(f"recorded delete action for new drawer {drawer_id} in cabinet '{cabinet}'") # logs the recorded action type
-            else: # if it's an existing drawer
-                action_data['type'] = 'update' # marks the action type as 'update'
-                Logger.debug(f"recorded update action for drawer {drawer_id} in cabinet '{cabinet}'") # logs the recorded action type
-
-            self._record_action(action_data) # records the action for undo/redo
+            if old['name'] == new_name and old['qty'] == new_qty: # saving the same contents again, e.g. from a focus change in the ui
+                Logger.debug("drawer %s in cabinet '%s' unchanged, skipping write", drawer_id, cabinet) # logs that nothing was written
+                return False # no write and no undo step for a change that did nothing
+            self._record_action([self._build_action(drawer_id, cabinet, old, new_name, new_qty)]) # records the action for undo/redo as its own step
 
             self._update_drawer_in_db(drawer_id, new_name, new_qty, cabinet) # updates the drawer in the database
-            Logger.info(f"updated drawer {drawer_id} in cabinet '{cabinet}' in db to name '{new_name}', qty {new_qty}") # logs a success message for the database update
+            Logger.info("updated drawer %s in cabinet '%s' in db to name '%s', qty %s", drawer_id, cabinet, new_name, new_qty) # logs a success message for the database update
+            return True # the drawer was written
         except Exception as e: # catches any exception that occurs during the update
-            Logger.error(f"error updating drawer '{drawer_id}' in cabinet '{cabinet}': {e}") # logs an error message
+            Logger.error("error updating drawer '%s' in cabinet '%s': %s", drawer_id, cabinet, e) # logs an error message
             raise # re-raises the exception
 
-    def _record_action(self, action):
-        """records an action in the history and clears the redo stack.
+    def update_drawers_bulk(self, drawers, cabinet='Default'):
+        """updates several drawers in a single database transaction and records each change for undo/redo.
 
         Args:
-            action (dict): a dictionary containing the details of the action performed.
+            drawers (list): (drawer_id, new_name, new_qty) tuples, applied in order.
+            cabinet (str, optional): the name of the cabinet where the drawers are located. Defaults to 'Default'.
+
+        Raises:
+            Exception: if the bulk update fails, in which case none of the drawers are changed.
+
+        Returns:
+            int: the number of drawers written.
         """
-        self.action_history.append(action) # adds the action to the action history list
+        try: # handles errors during the bulk update
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                c = conn.cursor() # creates a cursor object
+                pending = {} # drawer id -> state written earlier in this batch, so repeated ids chain correctly
+                actions = [] # actions to record once the transaction has committed
+                params = [] # parameter tuples for the insert statement
+                for drawer_id, new_name, new_qty in drawers: # iterates through each requested change
+                    if not drawer_id or len(drawer_id) < 2: # checks if the drawer_id is invalid
+                        Logger.warning("invalid drawer_id provided to update_drawers_bulk: '%s'", drawer_id) # logs a warning for an invalid drawer ID
+                        continue # skips the invalid entry
+                    row_char, column_num = _split_id(drawer_id) # separates the row character and column number, converting row to uppercase
+                    old = pending.get((row_char, column_num)) # checks if this drawer was already changed in this batch
+                    if old is None: # otherwise reads its current state from the database
+                        c.execute(_DRAWER_SQL, (row_char, column_num, cabinet)) # selects the current name and quantity
+                        result_row = c.fetchone() # fetches the matching row if any
+                        old = {"name": result_row[0] or "", "qty": result_row[1] or 0} if result_row else {"name": "", "qty": 0} # same defaults as get_drawer
+                    actions.append(self._build_action(drawer_id, cabinet, old, new_name, new_qty)) # prepares the undo/redo entry
+                    params.append((cabinet, row_char, column_num, new_name, new_qty)) # queues the row for the insert
+                    pending[(row_char, column_num)] = {"name": new_name, "qty": new_qty} # remembers the new state for later entries
+                c.executemany( # writes every drawer with one prepared statement
+                    _UPSERT_SQL, # sql statement to insert or update
+                    params # parameters for each drawer
+                )
+                conn.commit() # commits all drawers in one transaction
+            if params and cabinet: # empty names are never listed
+                self._cabinets.add(cabinet) # the cabinet now has stored drawers
+            if actions: # checks if anything was written
+                self._record_action(actions) # records the whole batch as one undo step, only after the data is safely written
+            Logger.info("bulk updated %s drawers in cabinet '%s'", len(params), cabinet) # logs a success message
+            return len(params) # returns how many drawers were written
+        except Exception as e: # catches any exception that occurs
+            Logger.error("failed to bulk update drawers in cabinet '%s': %s", cabinet, e) # logs an error message
+            raise # re-raises the exception
+
+    def update_drawer_rc(self, row, col, new_name, new_qty, cabinet='Default'):
+        """updates a drawer addressed by numeric row and column, see update_drawer.
+
+        Args:
+            row (int): the character code of the drawer row (e.g., 65 for "A").
+            col (int): the column number of the drawer.
+            new_name (str): the new name for the drawer.
+            new_qty (int): the new quantity for the drawer.
+            cabinet (str, optional): the name of the cabinet where the drawer is located. Defaults to 'Default'.
+
+        Raises:
+            ValueError: if the row is not a valid character code.
+            Exception: if the drawer update operation fails.
+
+        Returns:
+            bool: true if the drawer was written, false if it already held the new name and quantity.
+        """
+        return self.update_drawer(_drawer_key(row, col), new_name, new_qty, cabinet) # reuses the cached drawer id for this row/column
+
+    def _build_action(self, drawer_id, cabinet, old, new_name, new_qty):
+        """builds the undo/redo action for changing a drawer from its old state to a new one.
+
+        Args:
+            drawer_id (str): the ID of the drawer (e.g., "A1").
+            cabinet (str): the name of the cabinet where the drawer is located.
+            old (dict): the current name and quantity of the drawer.
+            new_name (str): the new name for the drawer.
+            new_qty (int): the new quantity for the drawer.
+
+        Returns:
+            dict: the action details to pass to _record_action.
+        """
+        is_new = (old['name'] == '' and old['qty'] == 0) # checks if the drawer is currently empty (considered "new" for action recording)
+
+        action_data = { # prepares a dictionary to store action details
+            'id': drawer_id, # stores the drawer ID
+            'cabinet': cabinet, # stores the cabinet name
+            'prev_name': old['name'], # stores the previous name of the drawer
+            'prev_qty': old['qty'], # stores the previous quantity of the drawer
+            'new_name': new_name, # stores the new name for the drawer
+            'new_qty': new_qty # stores the new quantity for the drawer
+        }
+
+        if is_new: # checks if it's a new drawer being added (from an empty state)
+            action_data['type'] = 'delete' # marks the action type as 'delete' for undo purposes (to revert to empty)
+        else: # if it's an existing drawer
+            action_data['type'] = 'update' # marks the action type as 'update'
+        return action_data # returns the prepared action
+
+    def _record_action(self, actions):
+        """records an undo step in the history and clears the redo stack.
+
+        Args:
+            actions (list): the action dictionaries of the step, in the order they were applied.
+        """
+        self.action_history.append(actions) # adds the step to the action history
         self.redo_stack.clear() # clears the redo stack because a new action invalidates future redos
 
     def clear_inventory(self):
@@ -202,18 +425,30 @@ class InventoryManager:
             Exception: if clearing the inventory fails.
         """
         try: # handles errors during inventory clearing
-            conn = self._connect() # establishes a connection to the database
-            c = conn.cursor() # creates a cursor object
-            c.execute("DELETE FROM drawers") # executes a sql command to delete all rows from the 'drawers' table
-            conn.commit() # commits the transaction
-            conn.close() # closes the database connection
+            with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+                c = conn.cursor() # creates a cursor object
+                c.execute("DELETE FROM drawers") # executes a sql command to delete all rows from the 'drawers' table
+                conn.commit() # commits the transaction
+            self._cabinets.clear() # no cabinet has drawers anymore
             Logger.info("inventory database cleared (all cabinets).") # logs a success message
         except Exception as e: # catches any exception that occurs
-            Logger.error(f"failed to clear inventory: {e}") # logs an error message
+            Logger.error("failed to clear inventory: %s", e) # logs an error message
             raise # re-raises the exception
 
+    def _write_drawers(self, rows):
+        """writes several drawers, possibly in different cabinets, in a single transaction.
+
+        Args:
+            rows (list): (drawer_id, name, qty, cabinet) tuples, applied in order.
+        """
+        params = [(cabinet, *_split_id(drawer_id), name, qty) for drawer_id, name, qty, cabinet in rows] # splits each drawer id into row and column
+        with self._connection() as conn: # borrows a pooled connection, returned when the block ends
+            conn.executemany(_UPSERT_SQL, params) # writes every drawer with one prepared statement
+            conn.commit() # commits all drawers in one transaction
+        self._cabinets.update(cabinet for cabinet, *_ in params if cabinet) # undo/redo can write into any cabinet
+
     def undo(self):
-        """reverts the last performed action.
+        """reverts the last performed action, or every drawer of the last bulk update at once.
 
         Returns:
             bool: true if the undo operation was successful, false otherwise.
@@ -222,25 +457,29 @@ class InventoryManager:
             Logger.warning("undo called but action history is empty") # logs a warning if there's nothing to undo
             return False # returns false if no actions to undo
 
-        action = self.action_history.pop() # retrieves and removes the last action from the history
-        Logger.debug(f"undoing action: {action}") # logs the action being undone
+        actions = self.action_history.pop() # retrieves and removes the last step
+        Logger.debug("undoing actions: %s", actions) # logs the actions being undone
 
         try: # handles errors during the undo operation
-            cabinet_for_undo = action.get('cabinet', 'Default') # gets the cabinet name for the action, defaulting to 'Default'
-            if action['type'] == 'update': # checks if the action was an 'update'
-                self._update_drawer_in_db(action['id'], action['prev_name'], action['prev_qty'], cabinet_for_undo) # reverts the drawer to its previous state
-            elif action['type'] == 'delete': # checks if the action was a 'delete' (meaning a new drawer was added)
-                self._update_drawer_in_db(action['id'], '', 0, cabinet_for_undo) # "deletes" the newly added drawer by setting its name and qty to empty/zero
-            
-            self.redo_stack.append(action) # adds the undone action to the redo stack
-            Logger.info(f"undo successful for drawer {action['id']} in cabinet '{cabinet_for_undo}'") # logs a success message
+            rows = [] # drawers to write, newest change first so repeated drawers end at their oldest state
+            for action in reversed(actions): # iterates through the actions being undone, newest first
+                cabinet_for_undo = action.get('cabinet', 'Default') # gets the cabinet name for the action, defaulting to 'Default'
+                if action['type'] == 'update': # checks if the action was an 'update'
+                    rows.append((action['id'], action['prev_name'], action['prev_qty'], cabinet_for_undo)) # reverts the drawer to its previous state
+                elif action['type'] == 'delete': # checks if the action was a 'delete' (meaning a new drawer was added)
+                    rows.append((action['id'], '', 0, cabinet_for_undo)) # "deletes" the newly added drawer by setting its name and qty to empty/zero
+            self._write_drawers(rows) # reverts the whole step in one transaction
+
+            self.redo_stack.append(actions) # adds the undone step to the redo stack
+            Logger.info("undo successful for %s drawer(s), last %s in cabinet '%s'", len(actions), actions[-1]['id'], actions[-1].get('cabinet', 'Default')) # logs a success message
             return True # returns true indicating successful undo
         except Exception as e: # catches any exception that occurs during undo
-            Logger.error(f"undo failed: {e}") # logs an error message
+            self.action_history.append(actions) # puts the step back so it can be retried
+            Logger.error("undo failed: %s", e) # logs an error message
             return False # returns false if undo failed
 
     def redo(self):
-        """re-applies the last undone action.
+        """re-applies the last undone action, or every drawer of an undone bulk update at once.
 
         Returns:
             bool: true if the redo operation was successful, false otherwise.
@@ -249,32 +488,23 @@ class InventoryManager:
             Logger.warning("redo called but redo stack is empty") # logs a warning if there's nothing to redo
             return False # returns false if no actions to redo
 
-        action = self.redo_stack.pop() # retrieves and removes the last action from the redo stack
-        Logger.debug(f"redoing action: {action}") # logs the action being redone
+        actions = self.redo_stack.pop() # retrieves and removes the last undone step
+        Logger.debug("redoing actions: %s", actions) # logs the actions being redone
 
         try: # handles errors during the redo operation
-            cabinet_for_redo = action.get('cabinet', 'Default') # gets the cabinet name for the action, defaulting to 'Default'
-            self._update_drawer_in_db(action['id'], action['new_name'], action['new_qty'], cabinet_for_redo) # re-applies the action by setting the drawer to its new state
-            self.action_history.append(action) # adds the redone action back to the action history
-            Logger.info(f"redo successful for drawer {action['id']} in cabinet '{cabinet_for_redo}'") # logs a success message
+            self._write_drawers([(action['id'], action['new_name'], action['new_qty'], action.get('cabinet', 'Default')) for action in actions]) # re-applies the step in its original order in one transaction
+            self.action_history.append(actions) # adds the redone step back to the action history
+            Logger.info("redo successful for %s drawer(s), last %s in cabinet '%s'", len(actions), actions[-1]['id'], actions[-1].get('cabinet', 'Default')) # logs a success message
             return True # returns true indicating successful redo
         except Exception as e: # catches any exception that occurs during redo
-            Logger.error(f"redo failed: {e}") # logs an error message
+            self.redo_stack.append(actions) # puts the step back so it can be retried
+            Logger.error("redo failed: %s", e) # logs an error message
             return False # returns false if redo failed
-    
+
     def get_all_cabinets(self):
-        """retrieves a list of all unique cabinet names from the database.
+        """retrieves a list of all unique cabinet names, kept in memory and updated by every write.
 
         Returns:
             list: a sorted list of unique cabinet names.
         """
-        try: # handles errors during cabinet retrieval
-            conn = self._connect() # establishes a connection to the database
-            cursor = conn.cursor() # creates a cursor object
-            cursor.execute("SELECT DISTINCT cabinet FROM drawers") # executes a query to select all unique cabinet names
-            results = cursor.fetchall() # fetches all matching results
-            conn.close() # closes the database connection
-            return sorted([r[0] for r in results if r[0]]) # extracts cabinet names, filters out empty strings, and returns a sorted list
-        except Exception as e: # catches any exception that occurs
-            Logger.error(f"failed to get all cabinets: {e}") # logs an error message
-            return [] # returns an empty list in case of an error
+        return sorted(self._cabinets.copy()) # copies first so a write on another thread can't change the set mid-sort
@@ -0,0 +1,54 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """json provider that encodes and decodes with orjson instead of the standard json module.
+    """
+    def _options(self, sort_keys):
+        """builds the orjson option flags matching the provider settings.
+
+        Args:
+            sort_keys (bool): whether object keys should be sorted in the output.
+
+        Returns:
+            int: the combined orjson option flags.
+        """
+        option = orjson.OPT_NON_STR_KEYS # allows non-string dictionary keys like the standard json module does
+        if sort_keys: # checks if keys should be sorted
+            option |= orjson.OPT_SORT_KEYS # sorts object keys
+        return option # returns the combined flags
+
+    def dumps(self, obj, **kwargs):
+        """serializes an object to a JSON string.
+
+        Args:
+            obj (any): the data to serialize.
+            **kwargs: sort_keys and default are honored, other standard json arguments are ignored.
+
+        Returns:
+            str: the JSON string.
+        """
+        default = kwargs.pop('default', self.default) # fallback for types orjson does not know natively
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys) # uses the provider setting unless overridden
+        return orjson.dumps(obj, default=default, option=self._options(sort_keys)).decode() # encodes with orjson and decodes the bytes to a string
+
+    def loads(self, s, **kwargs):
+        """deserializes JSON data.
+
+        Args:
+            s (str | bytes): the JSON text to parse.
+
+        Returns:
+            any: the parsed data.
+        """
+        return orjson.loads(s) # parses with orjson, accepts both str and bytes
+
+    def response(self, *args, **kwargs):
+        """creates a JSON response, used by flask.jsonify.
+
+        Returns:
+            flask.Response: a response whose body is the orjson-encoded data.
+        """
+        obj = self._prepare_response_obj(args, kwargs) # same argument handling as the default provider
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys)) # encodes straight to bytes, no intermediate string
+        return self._app.response_class(body, mimetype=self.mimetype) # builds the response with the JSON mimetype
@@ -1,28 +1,47 @@
-import subprocess
+import os
+import time
 import psutil
 import socket
 import datetime
 from Logger import Logger
 
 class SystemStats:
-    @staticmethod
-    def get_cpu_temp():
+    CACHE_SECONDS = 1.0 # how long get_all_stats reuses its last result
+    TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp" # cpu temperature of the raspie in millidegrees
+
+    def __init__(self):
+        """sets up the stats cache and starts cpu usage tracking
+        """
+        self._cache = None # last result of get_all_stats
+        self._cache_ts = 0.0 # when it was collected, on the monotonic clock
+        psutil.cpu_percent(interval=None) # first call only starts the measurement, later calls report usage since the previous one
+        self._boot_time = psutil.boot_time() # boot time never changes while running
+        self._ip = None # detected on first use, then reused
+        try:
+            self._temp_fd = os.open(self.TEMP_PATH, os.O_RDONLY) # kept open, sysfs gives a fresh value on every read from the start
+        except OSError as e: # not a raspie, or no thermal zone
+            Logger.warning("CPU temp not available: %s", e) # log it once instead of on every read
+            self._temp_fd = None # get_cpu_temp answers N/A
+
+    def get_cpu_temp(self):
         """Gets the tempurature of the CPU from the system (raspberry pi 4 model B)
 
         Returns:
             String: tempurature 
         """
         try:
-            temp_str = subprocess.getoutput("cat /sys/class/thermal/thermal_zone0/temp") # get the temp of the raspie
+            if self._temp_fd is None: # no thermal zone to read
+                return "N/A" # return N/A so its not empty space
+            temp_str = os.pread(self._temp_fd, 16, 0).decode().strip() # read the temp of the raspie from offset 0 of the open file, no open or seek per call
             if temp_str.isdigit(): # if its a float number
                 temp = round(int(temp_str) / 1000, 1) # cast to string
-                Logger.info(f"CPU temp read successfully: {temp}°C") # log text with temp number
+                Logger.info("CPU temp read successfully: %s°C", temp) # log text with temp number
                 return temp # return temp
             else: # if it doesn't exist or not a digit
-                Logger.warning(f"Unexpected CPU temp format: '{temp_str}'") # log the warning
+                Logger.warning("Unexpected CPU temp format: '%s'", temp_str) # log the warning
                 return "N/A" # return N/A so its not empty space
         except Exception as e:  # catch errors
-            Logger.error(f"Failed to get CPU temp: {e}") # log the error
+            Logger.error("Failed to get CPU temp: %s", e) # log the error
             return "N/A" # set to N/A so its not empty space
 
     @staticmethod
@@ -33,11 +52,11 @@ class SystemStats:
             float: percentage
         """
         try:
-            usage = psutil.cpu_percent(interval=0.5) # get the cpu percentage utilization
-            Logger.info(f"CPU usage read successfully: {usage}%") # log that it was got
+            usage = psutil.cpu_percent(interval=None) # cpu percentage utilization since the previous call, without blocking
+            Logger.info("CPU usage read successfully: %s%%", usage) # log that it was got
             return usage # return this number
         except Exception as e:
-            Logger.error(f"Failed to get CPU usage: {e}") # log the error
+            Logger.error("Failed to get CPU usage: %s", e) # log the error
             return 0.0 # set to 0
 
     @staticmethod
@@ -51,10 +70,10 @@ class SystemStats:
             mem = psutil.virtual_memory() # get the memory utilization 
             used = round(mem.used / (1024*1024)) # divide it over raspie ram and round it
             total = round(mem.total / (1024*1024)) # same with total memory
-            Logger.info(f"Memory usage read successfully: used {used}MB, total {total}MB") # log this infomation
+            Logger.info("Memory usage read successfully: used %sMB, total %sMB", used, total) # log this infomation
             return (used, total) # return these numbers
         except Exception as e:
-            Logger.error(f"Failed to get memory usage: {e}") # log the error
+            Logger.error("Failed to get memory usage: %s", e) # log the error
             return (0, 0) # return 0s
 
     @staticmethod
@@ -67,33 +86,43 @@ class SystemStats:
         try:
             disk = psutil.disk_usage('/') # get the disk utilization and space
             free_gb = round(disk.free / (1024*1024*1024), 2) # divide free space over the total space of the raspie
-            Logger.info(f"Disk free space read successfully: {free_gb}GB") # log this information
+            Logger.info("Disk free space read successfully: %sGB", free_gb) # log this information
             return free_gb # return the total free space
         except Exception as e:
-            Logger.error(f"Failed to get disk free space: {e}") # log the error
+            Logger.error("Failed to get disk free space: %s", e) # log the error
             return 0.0 # return 0s
 
-    @staticmethod
-    def get_uptime():
+    def get_uptime(self):
         """gets the uptime of the Raspie
 
         Returns:
             String: uptime
         """
         try:
-            boot_time = psutil.boot_time() # get the boot time
-            now = datetime.datetime.now().timestamp() # get the date and time as of right now
-            uptime_seconds = int(now - boot_time) # calculate uptime and cast to integer
+            uptime_seconds = int(time.time() - self._boot_time) # calculate uptime from the boot time read at startup and cast to integer
             uptime_str = str(datetime.timedelta(seconds=uptime_seconds)) # set uptime to string
-            Logger.info(f"System uptime calculated successfully: {uptime_str}") # log this info
+            Logger.info("System uptime calculated successfully: %s", uptime_str) # log this info
             return uptime_str # return string value
         except Exception as e:
-            Logger.error(f"Failed to get uptime: {e}") # log error
+            Logger.error("Failed to get uptime: %s", e) # log error
             return "N/A" # return N/A so its not blank
 
+    def get_ip(self):
+        """gets the ip of the raspie, detected once and then reused
+
+        Returns:
+            String: ip address
+        """
+        if self._ip is None: # not detected yet, or the last attempt failed
+            ip = self._detect_ip() # look it up
+            if ip == 'N/A': # detection failed, try again next time
+                return ip # return N/A so its not empty
+            self._ip = ip # remember it
+        return self._ip # return this ip
+
     @staticmethod
-    def get_ip():
-        """gets the ip of the raspie
+    def _detect_ip():
+        """finds the ip of the raspie by opening a udp socket towards the internet, nothing is sent
 
         Returns:
             String: ip address
@@ -102,10 +131,10 @@ class SystemStats:
         try:
             s.connect(('8.8.8.8', 80)) # connect to socket
             ip = s.getsockname()[0] # get the ip of the socket
-            Logger.info(f"IP address detected successfully: {ip}") # log the ip
+            Logger.info("IP address detected successfully: %s", ip) # log the ip
             return ip # return this ip
         except Exception as e:
-            Logger.error(f"Failed to get IP address: {e}") # log the error
+            Logger.error("Failed to get IP address: %s", e) # log the error
             return 'N/A' # set to N/A so its not empty
         finally:
             s.close() # close the connection
@@ -116,20 +145,25 @@ class SystemStats:
         Returns:
             String: everything
         """
+        now = time.monotonic() # current time for the cache check
+        if self._cache is not None and now - self._cache_ts < self.CACHE_SECONDS: # collected recently enough
+            return self._cache # reuse it instead of reading everything again
         try:
+            mem_used, mem_total = self.get_mem_usage() # read memory once for both values
             stats = { # create a list  of these items that calls the methods 
                 "cpu_temp": self.get_cpu_temp(),
                 "cpu_usage": self.get_cpu_usage(),
-                "mem_used": self.get_mem_usage()[0],
-                "mem_total": self.get_mem_usage()[1],
+                "mem_used": mem_used,
+                "mem_total": mem_total,
                 "disk_free": self.get_disk_free(),
                 "uptime": self.get_uptime(),
                 "ip_address": self.get_ip()
             }
             Logger.info("All system stats collected successfully") # log that they where all successful
+            self._cache, self._cache_ts = stats, now # remember the result for the next second
             return stats # return this list
         except Exception as e:
-            Logger.error(f"Failed to collect all system stats: {e}") # log the error
+            Logger.error("Failed to collect all system stats: %s", e) # log the error
             return {
                 "cpu_temp": "N/A",
                 "cpu_usage": 0.0,
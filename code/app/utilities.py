@@ -1,33 +1,119 @@
+import gzip
+import zlib
+
+EMPTY_DRAWER = {"name": "", "qty": 0} # shared by every padded drawer, never modify it
+
 def pad_inventory(inventory):
     """all drawer maker
 
     Args:
-        inventory (String): identifiers for specific drawers
+        inventory (dict): drawers that have data, keyed by their identifiers
 
     Returns:
-        inventory: all values for a unique drawer
+        dict: a new dict with every drawer in cabinet order, empty ones share EMPTY_DRAWER, drawers outside the layout come last
     """
-    for row in ['A', 'B', 'C', 'D']: # small drawers
-        for col in range(1, 10): # loop through row/column
-            key = f"{row}{col}" # set a key for each one
-            if key not in inventory: # if there isnt already a key of the drawer
-                inventory[key] = {"name": "", "qty": 0} # create one with default values
-    for row in ['E', 'F', 'G']: # large drawers
-        for col in range(1, 5): # loop through row/column
-            key = f"{row}{col}" # unique key for each drawer
-            if key not in inventory: # if it doesn't exist
-                inventory[key] = {"name": "", "qty": 0} # create a default one
-    return inventory # return these drawers
+    padded = _EMPTY_INVENTORY.copy() # every drawer already empty
+    padded.update(inventory) # fill in the ones that have data
+    return padded # return these drawers
+
+_ALL_KEYS = tuple( # every drawer key, built once when the module is imported
+    [f"{row}{col}" for row in "ABCD" for col in range(1, 10)] # rows A-D have 9 columns
+    + [f"{row}{col}" for row in "EFG" for col in range(1, 5)] # rows E-G have 4 columns
+)
 
 def generate_all_drawer_keys():
     """makes all the drawer unique key value
 
     Returns:
-        keys: row/column for each drawer
+        tuple: row/column for each drawer, the same prebuilt tuple on every call
+    """
+    return _ALL_KEYS # the layout is fixed, so the keys never need rebuilding
+
+_EMPTY_INVENTORY = dict.fromkeys(generate_all_drawer_keys(), EMPTY_DRAWER) # the padded inventory of an empty cabinet
+
+def pad_inventory_iter(inventory):
+    """all drawer walker, gives the drawers of pad_inventory in the same order without building the padded dict
+
+    Args:
+        inventory (dict): drawers that have data, keyed by their identifiers
+
+    Yields:
+        tuple: (drawer_id, name, qty) for every drawer in cabinet order, then drawers outside the layout
+    """
+    for key in generate_all_drawer_keys(): # every drawer in cabinet order
+        drawer = inventory.get(key, EMPTY_DRAWER) # stored data or an empty drawer
+        yield key, drawer.get('name', ''), drawer.get('qty', 0) # padded drawer
+    for key, drawer in inventory.items(): # drawers outside the layout come last
+        if key not in _EMPTY_INVENTORY: # skips the ones already given above
+            yield key, drawer.get('name', ''), drawer.get('qty', 0) # extra drawer
+
+def csv_escape(value):
+    """quotes a CSV field the way csv.writer does, but only pays for it when the field needs it
+
+    Args:
+        value (str): the field text
+
+    Returns:
+        str: the field, wrapped in quotes with inner quotes doubled if it contains a comma, quote, or line break
+    """
+    if ',' in value or '"' in value or '\n' in value or '\r' in value: # characters csv.writer would quote for
+        return '"' + value.replace('"', '""') + '"' # quoted field
+    return value # plain field
+
+def parse_bulk_line(line):
+    """splits one bulk update line into its fields
+
+    Args:
+        line (str): stripped line of bulk input, either "location, name, qty" or "location or name, qty"
+
+    Raises:
+        ValueError: if the quantity is not a whole number
+
+    Returns:
+        tuple: (location, name, qty) for three field lines, with the location uppercased and the name cleared when qty is 0,
+            (location or name, None, qty) for two field lines since only the current inventory can tell which it is,
+            or None if the line doesn't have two or three fields
+    """
+    first, sep, rest = line.partition(',') # first field
+    if not sep: # no comma at all
+        return None # malformed
+    second, sep, third = rest.partition(',') # second field and whatever is left
+    if not sep: # two fields
+        return first.strip(), None, int(second) # caller works out if the first field is a drawer or a name
+    if ',' in third: # more than three fields
+        return None # malformed
+    qty = int(third) # quantity is always the last field
+    return first.strip().upper(), (second.strip() if qty else ""), qty # a quantity of 0 clears the drawer
+
+def gzip_body(body, accept_encodings, threshold=1024, level=1):
+    """gzip compresses a response body when the client accepts it and it is big enough to be worth it
+
+    Args:
+        body (bytes): uncompressed response body
+        accept_encodings (Accept): parsed Accept-Encoding header of the request
+        threshold (int, optional): bodies this size or smaller are sent as they are. Defaults to 1024.
+        level (int, optional): gzip compression level. Defaults to 1 (fastest).
+
+    Returns:
+        tuple: body to send and whether it was compressed
+    """
+    if len(body) <= threshold or not accept_encodings['gzip']: # too small or client cant decode it
+        return body, False # send it as it is
+    return gzip.compress(body, level), True # compressed body
+
+def gzip_stream(chunks, level=6):
+    """gzip compresses a streamed response body one chunk at a time
+
+    Args:
+        chunks (iterable): bytes pieces of the uncompressed body
+        level (int, optional): gzip compression level. Defaults to 6.
+
+    Yields:
+        bytes: compressed data as it becomes available, ending with the gzip trailer
     """
-    keys = [] # initilize keys
-    for row in ['A', 'B', 'C', 'D']: # loop through each unique row
-        keys.extend(f"{row}{col}" for col in range(1, 10)) # loop through columns
-    for row in ['E', 'F', 'G']: # loop through each unique row
-        keys.extend(f"{row}{col}" for col in range(1, 5)) # loop through columns
-    return keys # return keys
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits 31 writes the gzip header and trailer
+    for chunk in chunks: # compresses the body as it is produced
+        data = compressor.compress(chunk) # may hold the data back until it has a full block
+        if data: # only send something when there is output
+            yield data # compressed block
+    yield compressor.flush() # whatever is left plus the trailer
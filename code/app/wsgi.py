@@ -0,0 +1,11 @@
+"""entry point for production WSGI servers, run from this folder, e.g.
+
+    gunicorn --workers 1 --threads 8 --worker-class gthread wsgi:application
+    waitress-serve --threads 8 --port 5000 wsgi:application
+
+keep a single worker process: the /api/inventory cache and the backup thread live in the process.
+"""
+from app import app, _start_backup
+
+_start_backup() # the backup thread runs next to whichever server imports this module
+application = app # the name WSGI servers look for
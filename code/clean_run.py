@@ -1,7 +1,8 @@
 import os
 import shutil
-import subprocess
 import sys
+import logging
+import atexit
 from app.Logger import Logger
 
 def clear_pycache_dirs(root_dir):
@@ -10,8 +11,9 @@ def clear_pycache_dirs(root_dir):
     Args:
         root_dir (file): directory of the root and/or root folder
     """
-    for dirpath, dirnames, filenames in os.walk(root_dir):
+    for dirpath, dirnames, _ in os.walk(root_dir): # os.walk is scandir based, only the directory names are needed
         if '__pycache__' in dirnames: # if theres is a folder named pycache
+            dirnames.remove('__pycache__') # prune it so the walk doesnt descend into the folder being deleted
             pycache_path = os.path.join(dirpath, '__pycache__') # create a path to it
             try:
                 shutil.rmtree(pycache_path) # try to remove path
@@ -28,12 +30,10 @@ def main():
         Logger.error(f"Error: {app_path} does not exist.") # log that it doesnt exist
         sys.exit(1) # exit early
 
-    try:
-        subprocess.run([sys.executable, app_path]) # create subprocess to execute the app.py file
-    except KeyboardInterrupt:
-        Logger.info("Ending session...") # end session if input was entered
-    except Exception as e:
-        Logger.error(f"An error occurred while running the app: {e}") # log error if couldn't run the program for some reason
+    Logger.listener.stop() # exec skips atexit, so drain the log queue here
+    atexit.unregister(Logger.listener.stop) # already stopped, dont stop it again if exec fails and the process exits normally
+    logging.shutdown() # flush the buffered log file and stdout before the process image is replaced
+    os.execv(sys.executable, [sys.executable, app_path]) # replace this process with the app instead of keeping a second interpreter waiting on it
 
 if __name__ == '__main__':
     main() # main loop calling main
@@ -1,72 +1,95 @@
 import sqlite3
 import os
+from functools import lru_cache
 from app.Logger import Logger
 
-DB_PATH = os.path.join(os.path.dirname(__file__), 'resources', 'database.db') # get the path to the database
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources') # resources folder next to this script, resolved once so it doesnt depend on the working directory
+DB_PATH = os.path.join(RESOURCES_DIR, 'database.db') # get the path to the database
+SCHEMA_VERSION = 2 # stored in the database once migrated, bump it whenever the schema below changes
+_DRAWERS_DDL = '''
+CREATE TABLE IF NOT EXISTS drawers (
+    id TEXT PRIMARY KEY,
+    row TEXT,
+    column TEXT,
+    name TEXT,
+    qty INTEGER,
+    cabinet TEXT
+)
+''' # the current drawers table, used both for a fresh database and when rebuilding an old one
 
-conn = sqlite3.connect(DB_PATH) # establish connection to database via sqlite3
-c = conn.cursor() # initialize cursor to execute sql commands
+@lru_cache(maxsize=1) # one connection per process, later calls reuse it with its page cache still warm
+def _get_conn():
+    """opens the connection reset_database uses when none is passed in
 
-c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='drawers'") # check if drawers table exists
-table_exists = c.fetchone() is not None # get table if it does exist
+    Returns:
+        sqlite3.Connection: connection to the database at DB_PATH
+    """
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False) # establish connection to database via sqlite3
+    conn.execute("PRAGMA journal_mode=WAL") # same journal mode the app uses, writes append to the wal instead of syncing a rollback journal
+    conn.execute("PRAGMA synchronous=NORMAL") # wal only needs to sync at checkpoints
+    conn.execute("PRAGMA temp_store=MEMORY") # temporary data for the table copies stays off disk
+    conn.execute("PRAGMA cache_size=-40000") # about 40MB of page cache so the copied table stays in memory
+    conn.execute("PRAGMA mmap_size=268435456") # reads pages through a 256MB memory map instead of read calls
+    conn.isolation_level = None # sqlite3 would otherwise open and commit its own transactions around the statements below
+    return conn # returns the database connection object
 
-if not table_exists: # if the table doesnt exist
-    c.execute(''' 
-    CREATE TABLE drawers (
-        id TEXT PRIMARY KEY,
-        row TEXT,
-        column TEXT,
-        name TEXT,
-        qty INTEGER,
-        cabinet TEXT
-    )
-    ''') # create new table with these identifiers
-    Logger.info("Table 'drawers' created.") # log info
-else: # if table does exist
-    c.execute("PRAGMA table_info(drawers)") # create table info with drawers
-    columns = {col[1]: col[2] for col in c.fetchall()} # fetch the columns for each column
+def reset_database(conn=None):
+    """brings the drawers table up to the current schema, migrating older layouts in one transaction
 
-    if columns.get('id') == 'INTEGER': # if id is an INTEGER type
-        Logger.info("Changing 'id' column from INTEGER to TEXT...") # log that its being changed
-        c.execute("ALTER TABLE drawers RENAME TO drawers_old") # rename to old reawers
-        c.execute('''
-        CREATE TABLE drawers (
-            id TEXT PRIMARY KEY,
-            row TEXT,
-            column TEXT,
-            name TEXT,
-            qty INTEGER,
-            cabinet TEXT
-        )
-        ''') # change id to text instead of integer
-        c.execute('''
-        INSERT INTO drawers (id, row, column, name, qty, cabinet)
-        SELECT id, row, column, name, qty, cabinet FROM drawers_old
-        ''') # change it in drawers
-        c.execute("DROP TABLE drawers_old") # update the dropdown bar of old drawers
-        Logger.info("Column 'id' converted to TEXT") # confirm that id has been converted
-    elif 'cabinet' not in columns: # id is an integer but cabinet is not in the database
-        Logger.info("Column 'cabinet' missing, migrating table schema...") # log that cabinet is being migrated into existing database
-        c.execute("ALTER TABLE drawers RENAME TO drawers_old") # alter current table
-        c.execute('''
-        CREATE TABLE drawers (
-            id TEXT PRIMARY KEY,
-            row TEXT,
-            column TEXT,
-            name TEXT,
-            qty INTEGER,
-            cabinet TEXT
-        )
-        ''') # add cabinets as text in fields
-        c.execute('''
-        INSERT INTO drawers (id, row, column, name, qty, cabinet)
-        SELECT id, row, column, name, qty, 'Default' FROM drawers_old
-        ''') # insert teh drawers into the table
-        c.execute("DROP TABLE drawers_old") # put old drawers into new ones
-        Logger.info("Table schema migrated with new 'cabinet' column.") # log that cabinet has been merged together
-    else:
-        Logger.info("Table and column 'cabinet' already exists.") # if table exists with cabinets then log that it does
+    Args:
+        conn (sqlite3.Connection, optional): connection to migrate through, with no transaction open. Defaults to the connection kept by _get_conn
+    """
+    conn = conn or _get_conn() # reuse the process wide connection unless the caller has one
+    c = conn.cursor() # initialize cursor to execute sql commands
 
-conn.commit() # commit these changes
-conn.close() # close connection to database
-Logger.info("Database setup complete.") # log conifmation
+    if c.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION: # already migrated by an earlier run
+        Logger.info("Database schema already at version %s, nothing to migrate.", SCHEMA_VERSION) # log that nothing was done
+        return # skip the table inspection entirely
+
+    c.execute("BEGIN IMMEDIATE") # the whole migration is one transaction, written once and undone completely if any step fails
+    try:
+        c.execute(_DRAWERS_DDL) # create the table with these identifiers if it doesnt exist yet, a new table then needs no migration below
+        columns = dict(c.execute("SELECT name, type FROM pragma_table_info('drawers') WHERE name IN ('id', 'cabinet')").fetchall()) # only the two columns the migration checks, filtered inside sqlite
+
+        if columns.get('id') == 'INTEGER': # if id is an INTEGER type
+            Logger.info("Changing 'id' column from INTEGER to TEXT...") # log that its being changed
+            c.execute("CREATE TEMP TABLE drawers_old AS SELECT id, row, column, name, qty, cabinet FROM main.drawers") # stage the old rows in the temp database, which temp_store keeps in memory
+            c.execute("DROP TABLE main.drawers") # frees the old pages so the new table reuses them instead of growing the file
+            c.execute(_DRAWERS_DDL) # change id to text instead of integer
+            c.execute('''
+            INSERT INTO main.drawers (id, row, column, name, qty, cabinet)
+            SELECT id, row, column, name, qty, cabinet FROM temp.drawers_old ORDER BY CAST(id AS TEXT)
+            ''') # change it in drawers, sorted as the new text ids so their primary key index is only ever appended to
+            c.execute("DROP TABLE temp.drawers_old") # the staged copy is no longer needed
+            Logger.info("Column 'id' converted to TEXT") # confirm that id has been converted
+        elif 'cabinet' not in columns: # id is an integer but cabinet is not in the database
+            Logger.info("Column 'cabinet' missing, migrating table schema...") # log that cabinet is being migrated into existing database
+            c.execute("ALTER TABLE drawers ADD COLUMN cabinet TEXT NOT NULL DEFAULT 'Default'") # only the schema changes, existing rows read the default without being copied
+            Logger.info("Table schema migrated with new 'cabinet' column.") # log that cabinet has been merged together
+        else:
+            Logger.info("Table and column 'cabinet' already exists.") # if table exists with cabinets then log that it does
+        c.execute("CREATE INDEX IF NOT EXISTS idx_drawers_cover ON drawers (cabinet, row, column, name, qty)") # the same index the app creates, every app query filters on cabinet first and is answered from it
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}") # part of the same transaction, so it is only stored if the migration commits
+        c.execute("COMMIT") # commit these changes
+    except Exception:
+        c.execute("ROLLBACK") # leave the database exactly as it was
+        raise # report the failure
+
+    if c.execute("PRAGMA freelist_count").fetchone()[0]: # pages the old layout or earlier deletes left unused, never the case for a new database
+        c.execute("VACUUM") # rewrites the file without them, only paid on a run that migrated
+    c.execute("PRAGMA analysis_limit=400") # keeps any analyze below cheap on a big table
+    c.execute("PRAGMA optimize") # refreshes the planner statistics the app's queries use, only where they are out of date
+    Logger.info("Database setup complete.") # log conifmation
+
+def main():
+    """runs the migration from the command line and closes the connection afterwards
+    """
+    conn = _get_conn() # opens the connection
+    try:
+        reset_database(conn) # migrate the database
+    finally:
+        conn.close() # close connection to database, checkpointing the wal
+        _get_conn.cache_clear() # a later call opens a fresh connection
+
+if __name__ == '__main__':
+    main() # only migrate when run as a script, importing this module has no side effects